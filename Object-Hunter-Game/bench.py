@@ -0,0 +1,220 @@
+"""
+Headless Benchmark - Scripted menu -> game -> game over session with a synthetic camera
+
+Runs without a webcam, GPU or display:
+    
+    python bench.py --source procedural --seconds 10 --output bench.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+# The SDL drivers must be selected before pygame initializes
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+
+from config import CAMERA_WIDTH, CAMERA_HEIGHT, PATHS, PROFILER
+from synthetic_camera import SyntheticCamera
+
+
+def peak_memory_mb():
+    """Peak resident set size of this process in MB, or None if unavailable"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def summarize(samples_ms):
+    """Percentile summary of a list of millisecond samples"""
+    if not samples_ms:
+        return {"count": 0}
+    
+    samples = np.asarray(samples_ms)
+    p50, p95, p99 = np.percentile(samples, (50, 95, 99))
+    return {
+        "count": len(samples_ms),
+        "mean": float(samples.mean()),
+        "p50": float(p50),
+        "p95": float(p95),
+        "p99": float(p99),
+        "max": float(samples.max())
+    }
+
+
+class BenchmarkSession:
+    """Drives a Game through a scripted session and collects timings"""
+    
+    def __init__(self, game, seconds_per_phase=5.0, max_frames_per_phase=None):
+        """Initialize session
+        
+        Args:
+            game: Game instance, set up but not yet running its own loop
+            seconds_per_phase: Wall time spent in each phase
+            max_frames_per_phase: Optional frame cap per phase
+        """
+        self.game = game
+        self.seconds_per_phase = seconds_per_phase
+        self.max_frames_per_phase = max_frames_per_phase
+        self.detection_latency_ms = []
+        self.result_age_ms = []
+        self._last_result_id = game.detector.result_frame_id
+    
+    def _collect_detection(self):
+        """Record latency of newly published detection results"""
+        detector = self.game.detector
+        if detector.result_frame_id == self._last_result_id:
+            return
+        
+        self._last_result_id = detector.result_frame_id
+        self.detection_latency_ms.append(detector.inference_time * 1000)
+        if detector.result_timestamp:
+            self.result_age_ms.append((time.time() - detector.result_timestamp) * 1000)
+    
+    def run_phase(self, name):
+        """Run frames until the phase time (or frame cap) is used up"""
+        game = self.game
+        frame_times = []
+        start_time = time.perf_counter()
+        
+        while game.running:
+            frame_start = time.perf_counter()
+            game.run_frame()
+            frame_times.append((time.perf_counter() - frame_start) * 1000)
+            self._collect_detection()
+            
+            if time.perf_counter() - start_time >= self.seconds_per_phase:
+                break
+            if self.max_frames_per_phase and len(frame_times) >= self.max_frames_per_phase:
+                break
+        
+        elapsed = time.perf_counter() - start_time
+        result = {
+            "frames": len(frame_times),
+            "seconds": elapsed,
+            "fps": len(frame_times) / elapsed if elapsed > 0 else 0.0,
+            "frame_ms": summarize(frame_times)
+        }
+        print(f"{name:>10}: {result['frames']:5d} frames  {result['fps']:6.1f} FPS  "
+              f"p95 {result['frame_ms'].get('p95', 0):6.2f} ms")
+        return result
+    
+    def run(self):
+        """Run the scripted menu -> game -> game over session"""
+        game = self.game
+        phases = {}
+        
+        phases["menu"] = self.run_phase("menu")
+        
+        # The game needs the model, keep showing the menu until it has loaded
+        while game.running and game.detector.state in ("loading", "warming"):
+            game.run_frame()
+        
+        game.transition_to_game()
+        phases["game"] = self.run_phase("game")
+        
+        # Expire the round timer so the next frame enters the game over screen
+        game.game_start_time = time.time() - game.difficulty_time - 1
+        phases["game_over"] = self.run_phase("game_over")
+        
+        return phases
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Object Hunter benchmark")
+    parser.add_argument("--source", default="procedural",
+                        help="procedural, a video file, an image directory or a glob pattern")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Seconds per phase")
+    parser.add_argument("--frames", type=int, default=None, help="Maximum frames per phase")
+    parser.add_argument("--camera-fps", type=float, default=None,
+                        help="Pace the synthetic camera to this rate (default: unpaced)")
+    parser.add_argument("--model", default=None, help="Model weights (default: PATHS['model'])")
+    parser.add_argument("--output", default=None, help="Write the report to this JSON file")
+    parser.add_argument("--min-fps", type=float, default=None,
+                        help="Exit with status 1 if the game phase runs slower than this")
+    parser.add_argument("--no-model", action="store_true",
+                        help="Accept a run without inference (UI only) instead of failing")
+    args = parser.parse_args()
+    
+    if args.model:
+        PATHS["model"] = args.model
+    
+    # The report already contains the stage timings, don't leave the game's
+    # own profiler export in the working directory
+    PROFILER["export_path"] = None
+    
+    # Imported here so the SDL environment and model override are in place first
+    from main import Game
+    
+    def camera_factory():
+        return SyntheticCamera(args.source, CAMERA_WIDTH, CAMERA_HEIGHT, fps=args.camera_fps)
+    
+    startup_start = time.perf_counter()
+    game = Game(camera_factory=camera_factory)
+    game.window.fps_limit = 0
+    game.profiler.enabled = True
+    if not game.setup():
+        return 1
+    startup_seconds = time.perf_counter() - startup_start
+    
+    try:
+        session = BenchmarkSession(game, args.seconds, args.frames)
+        phases = session.run()
+    finally:
+        game._cleanup()
+    
+    report = {
+        "source": args.source,
+        "resolution": [CAMERA_WIDTH, CAMERA_HEIGHT],
+        "startup_seconds": startup_seconds,
+        "model_load_seconds": game.detector.load_time,
+        "phases": phases,
+        "detection_latency_ms": summarize(session.detection_latency_ms),
+        "result_age_ms": summarize(session.result_age_ms),
+        "inference_size": game.detector.current_inference_size,
+        "motion_gate": game.detector.get_motion_stats(),
+        "scheduler": game.detector.scheduler.get_stats(),
+        "stages": game.profiler.get_stats()["stages"],
+        "peak_memory_mb": peak_memory_mb()
+    }
+    
+    latency = report["detection_latency_ms"]
+    print(f"Detection latency: {latency.get('count', 0)} runs, "
+          f"p50 {latency.get('p50', 0):.1f} ms, p95 {latency.get('p95', 0):.1f} ms")
+    if report["motion_gate"] is not None:
+        print(f"Motion gate skipped {report['motion_gate']['skip_ratio']:.0%} of inference runs")
+    if report["peak_memory_mb"] is not None:
+        print(f"Peak memory: {report['peak_memory_mb']:.1f} MB")
+    
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+    
+    if not args.no_model:
+        if game.detector.state == "failed":
+            print(f"Detection model failed to load ({game.detector.load_error}), "
+                  f"use --no-model to benchmark the UI alone")
+            return 1
+        if not session.detection_latency_ms:
+            print("No inference ran during the benchmark, use --no-model to benchmark the UI alone")
+            return 1
+    
+    if args.min_fps is not None and phases["game"]["fps"] < args.min_fps:
+        print(f"Game phase FPS {phases['game']['fps']:.1f} is below the required {args.min_fps:.1f}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+Confidence History - Ring buffer of per-class confidence for temporal target confirmation
+"""
+import numpy as np
+
+
+class ConfidenceHistory:
+    """Per-class max confidence over the last N inference runs, stored as an (N, num_classes) array"""
+    
+    def __init__(self, num_classes, size=3, mode="k_of_n", k=2, ema_alpha=0.5):
+        """Initialize history
+        
+        Args:
+            num_classes: Number of model classes
+            size: Number of inference runs kept (N)
+            mode: "k_of_n" (class above threshold in at least k of the last N runs)
+                  or "ema" (exponential moving average of confidence above threshold)
+            k: Votes needed in k_of_n mode
+            ema_alpha: Weight of the newest run in ema mode
+        """
+        if mode not in ("k_of_n", "ema"):
+            raise ValueError(f"Unknown vote mode: {mode}")
+        
+        self.num_classes = num_classes
+        self.size = size
+        self.mode = mode
+        self.k = min(k, size)
+        self.ema_alpha = ema_alpha
+        
+        self.confidences = np.zeros((size, num_classes), dtype=np.float32)
+        self.ema = np.zeros(num_classes, dtype=np.float32)
+        self.index = 0
+        self.count = 0
+    
+    def clear(self):
+        """Forget all runs"""
+        self.confidences.fill(0)
+        self.ema.fill(0)
+        self.index = 0
+        self.count = 0
+    
+    def push(self, detections):
+        """Add one inference run
+        
+        Args:
+            detections: Array with class_id and confidence fields (DETECTION_DTYPE)
+        """
+        row = self.confidences[self.index]
+        row.fill(0)
+        if len(detections):
+            np.maximum.at(row, detections["class_id"], detections["confidence"])
+        
+        self.ema *= 1 - self.ema_alpha
+        self.ema += row * self.ema_alpha
+        
+        self.index = (self.index + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+    
+    def votes(self, threshold):
+        """Classes confirmed over the window
+        
+        Returns:
+            np.ndarray: (num_classes,) bool
+        """
+        if self.mode == "ema":
+            return self.ema >= threshold
+        return np.count_nonzero(self.confidences >= threshold, axis=0) >= self.k
+    
+    def confirmed(self, class_id, threshold):
+        """Check whether a single class is confirmed over the window"""
+        if self.mode == "ema":
+            return bool(self.ema[class_id] >= threshold)
+        return int(np.count_nonzero(self.confidences[:, class_id] >= threshold)) >= self.k
+    
+    def latest(self):
+        """Per-class confidence of the most recent run"""
+        return self.confidences[self.index - 1]
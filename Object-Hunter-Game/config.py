@@ -19,6 +19,10 @@ WINDOW_NAME = "Object Hunter"
 CAMERA_WIDTH = 1280
 CAMERA_HEIGHT = 720
 
+# Camera settings
+CAMERA_INDEX = 0
+CAMERA_THREADED = True  # Grab frames on a background thread, read() returns the newest one
+
 # Game time settings
 GAME_TIME_SECONDS = 120  # Game duration 2 minutes
 
@@ -105,9 +109,58 @@ COLORS = {
 # Object detection settings
 DETECTION = {
     "confidence_threshold": 0.4,
-    "cooldown": 0.5,
-    "history_size": 3,
-    "required_consecutive": 2
+    "cooldown": 0.5,  # Fixed interval between runs, used when SCHEDULER["enabled"] is False
+    "history_size": 3,             # Inference runs kept for target confirmation (N)
+    "required_consecutive": 2,     # Runs out of N the target must appear in (k)
+    "vote_mode": "k_of_n",         # Confirmation vote: "k_of_n" or "ema" (confidence EMA above the threshold)
+    "vote_ema_alpha": 0.5,         # Weight of the newest run in "ema" mode
+    "async_inference": True,  # Run inference on a worker thread, render loop never waits for YOLO
+    "inference_worker": "thread",  # Where the model runs: "thread" or "process" (separate process, frames in shared memory)
+    "process_timeout": 10.0,       # Seconds without a result before the inference process is restarted
+    "class_filter": "difficulty",  # Classes the model looks for: "difficulty" (OBJECTS list), "target" (current target only) or None (all)
+    "inference_size": 640,         # Longest side of the frame fed to the model: a size, "auto" or None (full frame)
+    "inference_sizes": (320, 416, 512, 640),  # Candidate sizes for "auto"
+    "target_latency": 0.15,        # Auto mode picks the largest size whose inference stays under this (seconds)
+    "backend": "pytorch",          # Model format: "pytorch" (.pt weights), "onnx" or "openvino" (exported once and cached)
+    "warmup_frames": 2,            # Dummy frames run per inference size after loading, 0 to skip warm-up
+    "tracking": True,              # Track objects between inference runs and predict their boxes
+    "track_iou_threshold": 0.3,    # Minimum overlap to match a detection to a track
+    "track_max_missed": 2,         # Inference runs a track survives without a match
+    "track_max_prediction": 1.0,   # Longest time a box is extrapolated (seconds)
+    "track_min_hits": 2,           # Matches needed before a track counts as the found target
+    "motion_gate": True,           # Skip inference when the scene has not changed since the last run
+    "motion_threshold": 0.02,      # Fraction of pixels that must change to run inference
+    "motion_pixel_threshold": 15,  # Gray level difference for a pixel to count as changed
+    "motion_max_age": 2.0,         # Force an inference run after this many seconds
+    "tiling": None,                # Tiled inference for small objects: None (full frame), "center", "grid" or "focus" (last seen target)
+    "tile_grid": (2, 2),           # Columns and rows in "grid" mode
+    "tile_overlap": 0.2,           # Fraction of a tile shared with its neighbour
+    "tile_center_scale": 0.6,      # Center crop size relative to the frame ("center", and "focus" before the target is seen)
+    "tile_include_full": True,     # Also run the full frame in the same batch, so large objects are still found
+    "tile_nms_iou": 0.5            # Overlap above which detections from different tiles are merged
+}
+
+# Detection scheduling (sets the inference rate from latency, frame budget and game state)
+SCHEDULER = {
+    "enabled": True,              # False falls back to the fixed DETECTION["cooldown"]
+    "target_fps": 30,             # Render rate to protect, inference backs off when frames run over
+    "active_duty": 1.0,           # Share of time spent inferring during a round (1.0 = back to back)
+    "game_over_interval": 1.0,    # Minimum seconds between runs on the game over screen
+    "min_interval": 0.05          # Minimum seconds between runs
+}
+
+# Multi-session server settings (game_server.py)
+SERVER = {
+    "max_batch": 4,               # Most frames sent to the model in one batch
+    "max_wait": 0.02              # Longest a frame waits for others to fill a batch (seconds)
+}
+
+# Performance profiling (opt-in)
+PROFILER = {
+    "enabled": False,                       # Collect per-stage timings from startup
+    "hud_key": "f3",                        # Key that toggles the performance HUD
+    "window": 300,                          # Frames kept for rolling percentiles
+    "export_path": "profile_stats.json"     # Written on exit (.json or .csv), None to disable
 }
 
 # Target objects
@@ -138,6 +191,7 @@ PATHS = {
     "sounds": os.path.join("sounds", ""),
     "leaderboard": "leaderboard.json",
     "model": "yolo11x.pt",
+    "model_cache": os.path.join("models", ""),  # Exported ONNX / OpenVINO models
     "assets": os.path.join("assets", "")
 }
 
@@ -307,6 +361,7 @@ UI = {
     "corner_radius": 10,       # 圆角半径
     "menu_padding": 20,        # 菜单内边距
     "blur_amount": 21,         # 模糊效果强度
+    "hud_blur_scale": 4,       # 游戏状态栏在缩小到1/4的图像上模糊，1表示全分辨率
     "topbar_height": 70,       # 顶部栏高度
     "bottombar_height": 80,    # 底部栏高度
     "transition_time": 0.5,    # 过渡动画时间
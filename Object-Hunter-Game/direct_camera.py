@@ -4,12 +4,14 @@ DirectShow摄像头接口 - 提供更稳定的摄像头访问
 import cv2
 import os
 import time
+import threading
 import numpy as np
+from frame_pool import FramePool
 
 class DirectCamera:
     """DirectShow摄像头包装类"""
     
-    def __init__(self, camera_index=0, width=1280, height=720, fallback=True):
+    def __init__(self, camera_index=0, width=1280, height=720, fallback=True, threaded=False, frame_pool=None):
         """初始化摄像头接口
         
         参数:
@@ -17,6 +19,8 @@ class DirectCamera:
             width: 期望的宽度
             height: 期望的高度
             fallback: 是否在DirectShow失败时尝试其他方法
+            threaded: 是否使用后台线程持续抓帧（read()立即返回最新帧）
+            frame_pool: 共享的帧缓冲池（FramePool），None时创建自己的
         """
         self.camera = None
         self.camera_index = camera_index
@@ -29,6 +33,27 @@ class DirectCamera:
         self.max_retries = 5
         self.initialized = False
         
+        # 复用的帧缓冲：采集直接写入缓冲区，黑帧只生成一次
+        self.frame_pool = frame_pool if frame_pool is not None else FramePool()
+        self._frame_shape = (height, width, 3)  # 最近一帧的实际尺寸
+        
+        # 最新帧槽位（后台抓帧模式）
+        self.threaded = threaded
+        self.frame_seq = 0            # 最新帧的序号
+        self.frame_timestamp = 0      # 最新帧的采集时间
+        self.latest_ok = False        # 最近一次抓帧是否成功
+        self.max_grab_failures = 30   # 连续失败多少次后停止抓帧线程
+        self._lock = threading.Lock()
+        self._frame_cond = threading.Condition(self._lock)
+        self._grabber = None
+        self._grabbing = False
+        
+        # 三缓冲：抓帧线程写入_write_buffer，完成后与last_frame交换；
+        # read()把last_frame换到_read_buffer再返回，抓帧线程不会写调用方正在使用的帧
+        self._write_buffer = None
+        self._read_buffer = None
+        self._read_seq = 0
+        
         # 尝试设置环境变量优化摄像头访问
         os.environ["OPENCV_VIDEOIO_PRIORITY_MSMF"] = "1"  # 优先MSMF
         os.environ["OPENCV_VIDEOIO_PRIORITY_DSHOW"] = "2"  # 次优先DirectShow
@@ -38,10 +63,17 @@ class DirectCamera:
     
     def initialize(self):
         """初始化摄像头连接"""
+        # 关闭任何现有连接
+        self.release()
+        
+        opened = self._open_camera()
+        if opened and self.threaded:
+            self.start_capture()
+        return opened
+    
+    def _open_camera(self):
+        """依次尝试各种后端打开摄像头"""
         try:
-            # 关闭任何现有连接
-            self.release()
-            
             # 先尝试使用DirectShow
             if os.name == 'nt':
                 print(f"尝试使用DirectShow打开摄像头 #{self.camera_index}...")
@@ -118,24 +150,27 @@ class DirectCamera:
                 self.initialize()
             
             # 返回黑帧
-            black_frame = np.zeros((self.height, self.width, 3), dtype=np.uint8)
-            cv2.putText(black_frame, "摄像头未连接", (self.width//2-100, self.height//2), 
-                        cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
-            return False, black_frame
+            return self._black_frame("摄像头未连接")
         
         # 重置重试计数
         self.retry_count = 0
         
+        if self.threaded:
+            return self._read_latest()
+        
         try:
-            # 读取帧
-            ret, frame = self.camera.read()
+            # 读取帧到复用的缓冲区（尺寸不符时OpenCV会分配新帧，下次按新尺寸复用）
+            ret, frame = self.camera.read(self.frame_pool.get("capture", self._frame_shape))
             
             # 增加帧计数
             self.frame_count += 1
             
             if ret and frame is not None and frame.size > 0:
-                # 保存最后一帧
+                # 保存最后一帧（即采集缓冲区，下次read()时被覆盖）
+                self._frame_shape = frame.shape
                 self.last_frame = frame
+                self.frame_seq += 1
+                self.frame_timestamp = time.time()
                 return True, frame
             else:
                 print(f"读取帧失败 (帧 #{self.frame_count})")
@@ -145,10 +180,7 @@ class DirectCamera:
                     return False, self.last_frame
                 
                 # 否则返回黑帧
-                black_frame = np.zeros((self.height, self.width, 3), dtype=np.uint8)
-                cv2.putText(black_frame, "摄像头未连接", (self.width//2-100, self.height//2), 
-                            cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
-                return False, black_frame
+                return self._black_frame("摄像头未连接")
                 
         except Exception as e:
             print(f"读取帧时出错: {e}")
@@ -158,13 +190,127 @@ class DirectCamera:
             self.initialize()
             
             # 返回黑帧
-            black_frame = np.zeros((self.height, self.width, 3), dtype=np.uint8)
-            cv2.putText(black_frame, f"摄像头错误: {str(e)[:30]}", (self.width//2-150, self.height//2), 
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
-            return False, black_frame
+            return False, self.frame_pool.placeholder(self.width, self.height, f"摄像头错误: {str(e)[:30]}",
+                                                      scale=0.7, offset=150)
+    
+    def _read_latest(self, first_frame_timeout=1.0):
+        """后台抓帧模式下立即返回最新帧"""
+        # 抓帧线程已退出（连续失败），标记为未初始化，下次read()会重试
+        if self._grabber is None or not self._grabber.is_alive():
+            self.initialized = False
+            return self._black_frame("摄像头未连接")
+        
+        # 第一帧还没到达时短暂等待，避免启动阶段误判为读取失败
+        if self.frame_seq == 0:
+            ok, frame, _, _ = self.wait_for_frame(0, first_frame_timeout)
+            if frame is None:
+                return self._black_frame("摄像头未连接")
+            return ok, frame
+        
+        with self._lock:
+            return self.latest_ok, self._acquire_latest()
+    
+    def _acquire_latest(self):
+        """把最新帧换到读取缓冲区（需持有锁）
+        
+        返回:
+            读取缓冲区中的帧，抓帧线程在下次read()之前不会写入它
+        """
+        if self.frame_seq != self._read_seq:
+            self._read_buffer, self.last_frame = self.last_frame, self._read_buffer
+            self._read_seq = self.frame_seq
+        return self._read_buffer
+    
+    def wait_for_frame(self, after_seq=0, timeout=None):
+        """等待比指定序号更新的一帧
+        
+        参数:
+            after_seq: 调用方已经处理过的帧序号
+            timeout: 最长等待时间（秒），None表示一直等待
+            
+        返回:
+            (成功, 帧, 序号, 采集时间)，超时时成功为False并返回当前最新帧
+        """
+        if not self.threaded:
+            ret, frame = self.read()
+            return ret, frame, self.frame_seq, self.frame_timestamp
+        
+        with self._frame_cond:
+            got_new = self._frame_cond.wait_for(
+                lambda: self.frame_seq > after_seq or not self._grabbing, timeout)
+            ok = got_new and self.frame_seq > after_seq and self.latest_ok
+            return ok, self._acquire_latest(), self.frame_seq, self.frame_timestamp
+    
+    def start_capture(self):
+        """启动后台抓帧线程"""
+        if self._grabber is not None and self._grabber.is_alive():
+            return True
+        if not self.camera or not self.camera.isOpened():
+            return False
+        
+        self._grabbing = True
+        self._grabber = threading.Thread(target=self._capture_loop,
+                                         name="DirectCameraGrabber",
+                                         daemon=True)
+        self._grabber.start()
+        print(f"摄像头 #{self.camera_index} 后台抓帧线程已启动")
+        return True
+    
+    def stop_capture(self, timeout=1.0):
+        """停止后台抓帧线程"""
+        with self._frame_cond:
+            self._grabbing = False
+            self._frame_cond.notify_all()
+        
+        if self._grabber is not None and self._grabber is not threading.current_thread():
+            self._grabber.join(timeout)
+        self._grabber = None
+    
+    def _capture_loop(self):
+        """后台抓帧循环：不断读取，只保留最新的一帧"""
+        failures = 0
+        camera = self.camera
+        while self._grabbing:
+            try:
+                ret, frame = camera.read(self._write_buffer)
+            except Exception as e:
+                print(f"抓帧线程读取出错: {e}")
+                ret, frame = False, None
+            
+            self.frame_count += 1
+            
+            with self._frame_cond:
+                if ret and frame is not None and frame.size > 0:
+                    failures = 0
+                    # 写完的缓冲区成为最新帧，旧的最新帧用于下次写入
+                    self._write_buffer = self.last_frame
+                    self.last_frame = frame
+                    self.latest_ok = True
+                    self.frame_seq += 1
+                    self.frame_timestamp = time.time()
+                    self._frame_cond.notify_all()
+                    continue
+                
+                failures += 1
+                self.latest_ok = False
+            
+            if failures >= self.max_grab_failures:
+                print(f"连续 {failures} 次读取帧失败，停止抓帧线程")
+                break
+            time.sleep(0.01)
+        
+        with self._frame_cond:
+            self._grabbing = False
+            self._frame_cond.notify_all()
+    
+    def _black_frame(self, message):
+        """返回带提示文字的黑帧（缓存，调用方不应在其上绘制）"""
+        return False, self.frame_pool.placeholder(self.width, self.height, message)
     
     def release(self):
         """释放摄像头资源"""
+        self.stop_capture()
+        
         if self.camera is not None:
             try:
                 self.camera.release()
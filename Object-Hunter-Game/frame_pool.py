@@ -0,0 +1,64 @@
+"""
+Frame Pool - Reused frame buffers, so the capture -> mirror -> draw path allocates nothing per frame
+"""
+import cv2
+import numpy as np
+
+
+class FramePool:
+    """Named frame buffers and cached placeholder frames"""
+    
+    def __init__(self):
+        self._buffers = {}
+        self._placeholders = {}
+        self.allocations = 0      # Buffers allocated so far, stays constant in the steady state
+    
+    def get(self, name, shape, dtype=np.uint8):
+        """Get the buffer for a stage, reallocating only when the shape changes
+        
+        The contents are whatever the stage left there last time.
+        
+        Args:
+            name: Stage name, e.g. "capture" or "mirror"
+            shape: Frame shape
+            dtype: Frame data type
+        """
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.shape != tuple(shape) or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype=dtype)
+            self._buffers[name] = buffer
+            self.allocations += 1
+        return buffer
+    
+    def placeholder(self, width, height, message=None, color=(0, 0, 255), scale=1, offset=100):
+        """Black frame with an optional message, rendered once per size and message
+        
+        The frame is shared, callers must copy it (e.g. flip it into their own
+        buffer) before drawing on it.
+        
+        Args:
+            width: Frame width
+            height: Frame height
+            message: Text drawn left of center, None for a plain black frame
+            color: Text color (BGR)
+            scale: Text scale
+            offset: Distance of the text start from the horizontal center
+        """
+        key = (width, height, message, color, scale, offset)
+        frame = self._placeholders.get(key)
+        if frame is None:
+            frame = np.zeros((height, width, 3), dtype=np.uint8)
+            if message:
+                cv2.putText(frame, message, (width // 2 - offset, height // 2),
+                            cv2.FONT_HERSHEY_SIMPLEX, scale, color, 2)
+            self._placeholders[key] = frame
+            self.allocations += 1
+        return frame
+    
+    def mirror(self, frame, name="mirror"):
+        """Flip a frame horizontally into the stage buffer
+        
+        Returns:
+            np.ndarray: The mirrored frame (the pooled buffer)
+        """
+        return cv2.flip(frame, 1, dst=self.get(name, frame.shape, frame.dtype))
@@ -0,0 +1,479 @@
+"""
+Game Server - Several game sessions in one process sharing one batched detection model
+    
+    python game_server.py --source 0 --source 1
+    python game_server.py --source procedural --sessions 4
+
+Each session has its own camera (or video source), game state and detection
+history; frames from all sessions are queued and run through the model in
+batches. All sessions are shown in one window as a grid.
+"""
+import argparse
+import math
+import os
+import queue
+import sys
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from config import CAMERA_WIDTH, CAMERA_HEIGHT, CAMERA_THREADED, PATHS, PROFILER, SERVER, WINDOW_NAME
+from direct_camera import DirectCamera
+from object_detector import ObjectDetector
+from pygame_window import PygameWindow
+from synthetic_camera import SyntheticCamera
+
+
+class SessionDetector(ObjectDetector):
+    """Per-session detector whose inference runs on the server's shared model
+    
+    Frames are queued with the server instead of being run by a worker
+    thread of its own. Tiled inference is not used here, the batch already
+    holds one frame per session.
+    """
+    
+    def __init__(self, server):
+        """Initialize session detector
+        
+        Args:
+            server: InferenceServer that owns the model
+        """
+        super().__init__(load_model=False)
+        self.server = server
+        self._queued = False      # Whether this session is waiting in the server queue
+    
+    def start_async(self):
+        """Route frames to the server queue (the server runs the inference loop)"""
+        self.async_mode = True
+        return True
+    
+    def stop_async(self, timeout=2.0):
+        """Stop queueing frames"""
+        self.async_mode = False
+    
+    def submit_frame(self, frame, timestamp=None):
+        """Store the frame and queue this session for the next batch
+        
+        The session is queued at most once; a newer frame replaces the
+        pending one, so a batch always runs on the latest frame.
+        """
+        frame_id = super().submit_frame(frame, timestamp)
+        with self._lock:
+            if not self._queued:
+                self._queued = True
+                self.server.requests.put((self, time.perf_counter()))
+        return frame_id
+    
+    def take_request(self):
+        """Take the pending frame for a batch
+        
+        Applies the same checks as the single-session worker: the scheduler,
+        model readiness and the motion gate.
+        
+        Returns:
+            tuple: (frame, frame_id, timestamp), or None if no inference is needed
+        """
+        with self._lock:
+            self._queued = False
+            if not self._has_pending:
+                return None
+            self._pending_frame, self._working_frame = self._working_frame, self._pending_frame
+            frame_id = self._pending_id
+            timestamp = self._pending_timestamp
+            self._has_pending = False
+        
+        if not self.is_ready() or self.scheduler.time_until_next() is None:
+            return None
+        
+        # Scene unchanged, keep the previous results (the run stays due)
+        if self.motion_gate is not None and not self.motion_gate.should_run(self._working_frame):
+            self._reuse_results(timestamp)
+            return None
+        
+        self.scheduler.mark_run()
+        self.last_detection_time = time.time()
+        return self._working_frame, frame_id, timestamp
+
+
+class InferenceServer:
+    """Loads the model once and runs queued frames from all sessions in batches"""
+    
+    def __init__(self, max_batch=4, max_wait=0.02):
+        """Initialize inference server
+        
+        Args:
+            max_batch: Most frames run in one batch
+            max_wait: Longest the oldest queued frame waits for the batch to fill (seconds)
+        """
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.detector = ObjectDetector(load_in_background=True)
+        self.sessions = []
+        self.requests = queue.Queue()   # (SessionDetector, enqueue time)
+        
+        self.batches = 0
+        self.batch_frames = 0
+        self.batch_latency = 0.0        # Batch inference latency EMA (seconds)
+        self._running = False
+        self._thread = None
+    
+    def create_session(self):
+        """Create the detector for a new game session"""
+        session = SessionDetector(self)
+        self.sessions.append(session)
+        if self.detector.is_ready():
+            session.share_model(self.detector)
+        return session
+    
+    def start(self):
+        """Start the batching inference loop"""
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._batch_loop, name="InferenceServer", daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout=2.0):
+        """Stop the batching inference loop"""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def _sync_sessions(self):
+        """Hand the model to the sessions once it has loaded"""
+        state = self.detector.state
+        for session in self.sessions:
+            if session.state == state or session.state == "ready":
+                continue
+            if state == "ready":
+                session.share_model(self.detector)
+            else:
+                session.state = state
+                session.load_error = self.detector.load_error
+    
+    def _batch_loop(self):
+        """Collect queued frames into batches and run them"""
+        while self._running:
+            self._sync_sessions()
+            try:
+                session, queued_at = self.requests.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            
+            # Wait for more sessions until the batch is full or the oldest frame has waited long enough
+            batch = [session]
+            deadline = queued_at + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                try:
+                    session, _ = self.requests.get(timeout=remaining) if remaining > 0 else self.requests.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(session)
+            
+            self._run_batch(batch)
+    
+    def _run_batch(self, sessions):
+        """Run one batch and publish the results to each session"""
+        requests = []
+        for session in sessions:
+            request = session.take_request()
+            if request is not None:
+                requests.append((session,) + request)
+        if not requests:
+            return
+        
+        size = self.detector.current_inference_size
+        inputs, transforms = [], []
+        for session, frame, _, _ in requests:
+            model_input, scale = session._prepare_input(frame, size)
+            inputs.append(model_input)
+            transforms.append(scale + (0, 0))
+        
+        # One class filter for the whole batch: the union of the session filters
+        session_classes = [session.active_classes for session, _, _, _ in requests]
+        if any(classes is None for classes in session_classes):
+            classes = None
+        else:
+            classes = sorted(set().union(*session_classes))
+        
+        kwargs = {"classes": classes}
+        if size:
+            kwargs["imgsz"] = size
+        
+        try:
+            start_time = time.perf_counter()
+            results = self.detector.model(inputs, **kwargs)
+            latency = time.perf_counter() - start_time
+        except Exception as e:
+            print(f"Error during batched object detection: {e}")
+            return
+        
+        self.batches += 1
+        self.batch_frames += len(requests)
+        self.batch_latency = latency if self.batches == 1 else self.batch_latency * 0.8 + latency * 0.2
+        
+        # Each frame costs its share of the batch, the adaptive size and the
+        # session schedulers work from that rather than the whole batch
+        latency /= len(requests)
+        self.detector._update_inference_size(size, latency)
+        
+        for (session, _, frame_id, timestamp), result, transform in zip(requests, results, transforms):
+            detected_objects = session._extract_detections([result], [transform])
+            if classes is not None and session.active_classes != classes:
+                detected_objects = detected_objects[np.isin(detected_objects["class_id"], session.active_classes)]
+            session.inference_time = latency
+            session.current_inference_size = size
+            session.scheduler.record_latency(latency)
+            session._publish_results(detected_objects, frame_id, timestamp)
+    
+    def get_stats(self):
+        """Get batching statistics
+        
+        Returns:
+            dict: batch count, mean batch size, batch latency EMA (seconds) and queued sessions
+        """
+        return {
+            "batches": self.batches,
+            "mean_batch_size": self.batch_frames / self.batches if self.batches else 0.0,
+            "batch_latency": self.batch_latency,
+            "queued": self.requests.qsize()
+        }
+
+
+class SessionView:
+    """Window stand-in for one session, drawn into a cell of the server grid
+    
+    Has the PygameWindow interface Game uses; input events are routed to
+    it by the server.
+    """
+    
+    def __init__(self, grid, cell):
+        """Initialize session view
+        
+        Args:
+            grid: Shared grid image the view draws into
+            cell: (x, y, width, height) of this session's cell in the grid
+        """
+        self.grid = grid
+        self.cell = cell
+        self.width = CAMERA_WIDTH
+        self.height = CAMERA_HEIGHT
+        self.fps_limit = 0
+        self.created = False
+        self.game = None
+        self.mouse_callback_fn = None
+        self.mouse_move_callback_fn = None
+        self.last_key = -1
+        self._scaled = None
+    
+    def create(self):
+        self.created = True
+        return True
+    
+    def set_mouse_callback(self, callback_fn):
+        self.mouse_callback_fn = callback_fn
+        return True
+    
+    def set_mouse_move_callback(self, callback_fn):
+        self.mouse_move_callback_fn = callback_fn
+        return True
+    
+    def show(self, frame):
+        """Scale the frame into this session's grid cell"""
+        x, y, w, h = self.cell
+        self._scaled = cv2.resize(frame, (w, h), dst=self._scaled, interpolation=cv2.INTER_AREA)
+        self.grid[y:y + h, x:x + w] = self._scaled
+        return True
+    
+    def wait_key(self, delay=1):
+        """Return the last key routed to this session"""
+        key = self.last_key
+        self.last_key = -1
+        return key
+    
+    def to_local(self, x, y):
+        """Convert grid window coordinates to frame coordinates"""
+        cx, cy, w, h = self.cell
+        return int((x - cx) * self.width / w), int((y - cy) * self.height / h)
+    
+    def dispatch_click(self, x, y):
+        """Deliver a mouse click, as PygameWindow does"""
+        if self.mouse_callback_fn:
+            self.mouse_callback_fn(cv2.EVENT_LBUTTONDOWN, x, y, 0, None)
+        if self.game:
+            try:
+                self.game.handle_menu_input(cv2.EVENT_LBUTTONDOWN, x, y, 0, None)
+            except Exception as e:
+                print(f"Error in menu input handler: {e}")
+    
+    def dispatch_move(self, x, y):
+        """Deliver a mouse move, as PygameWindow does"""
+        if self.mouse_move_callback_fn:
+            self.mouse_move_callback_fn(cv2.EVENT_MOUSEMOVE, x, y, 0, None)
+        if self.game:
+            try:
+                self.game.handle_mouse_move(cv2.EVENT_MOUSEMOVE, x, y, 0, None)
+            except Exception as e:
+                print(f"Error in mouse move handler: {e}")
+    
+    def destroy(self):
+        self.created = False
+
+
+def open_source(source):
+    """Open a camera index ("0") or a synthetic source (procedural, video, image folder)"""
+    if source.isdigit():
+        return DirectCamera(int(source), CAMERA_WIDTH, CAMERA_HEIGHT, True, threaded=CAMERA_THREADED)
+    return SyntheticCamera(source, CAMERA_WIDTH, CAMERA_HEIGHT, fps=30)
+
+
+class GameServer:
+    """Runs several Game sessions in one window with a shared InferenceServer"""
+    
+    def __init__(self, sources, max_batch=None, max_wait=None):
+        """Initialize game server
+        
+        Args:
+            sources: One camera index / video source per session
+            max_batch: Batch size limit, defaults to SERVER["max_batch"]
+            max_wait: Batch latency cap, defaults to SERVER["max_wait"]
+        """
+        # Imported here so a caller can set up SDL and config overrides first
+        from main import Game
+        
+        self.inference = InferenceServer(SERVER["max_batch"] if max_batch is None else max_batch,
+                                         SERVER["max_wait"] if max_wait is None else max_wait)
+        
+        # Grid layout: cells keep the camera aspect ratio and the window stays camera sized
+        columns = math.ceil(math.sqrt(len(sources)))
+        rows = math.ceil(len(sources) / columns)
+        cell_w, cell_h = CAMERA_WIDTH // columns, CAMERA_HEIGHT // columns
+        self.grid = np.zeros((rows * cell_h, columns * cell_w, 3), dtype=np.uint8)
+        self.window = PygameWindow(f"{WINDOW_NAME} - {len(sources)} sessions",
+                                   columns * cell_w, rows * cell_h)
+        self.window.set_mouse_callback(self._route_click)
+        self.window.set_mouse_move_callback(self._route_move)
+        
+        self.views = []
+        self.games = []
+        for index, source in enumerate(sources):
+            cell = ((index % columns) * cell_w, (index // columns) * cell_h, cell_w, cell_h)
+            view = SessionView(self.grid, cell)
+            game = Game(detector=self.inference.create_session(),
+                        camera_factory=lambda source=source: open_source(source),
+                        window=view)
+            # Batched inference needs every session in async mode
+            game.detector.start_async()
+            # One profiler export per session, e.g. profile_stats_session2.json
+            if PROFILER["export_path"]:
+                root, ext = os.path.splitext(PROFILER["export_path"])
+                game.profiler_export_path = f"{root}_session{index + 1}{ext}"
+            self.views.append(view)
+            self.games.append(game)
+        
+        self.focused = 0          # Session that receives key presses (last clicked)
+        self.running = False
+    
+    def _view_at(self, x, y):
+        """Index of the session cell under a window position, or None"""
+        for index, view in enumerate(self.views):
+            cx, cy, w, h = view.cell
+            if cx <= x < cx + w and cy <= y < cy + h:
+                return index
+        return None
+    
+    def _route_click(self, event, x, y, flags, param):
+        index = self._view_at(x, y)
+        if index is not None:
+            self.focused = index
+            self.views[index].dispatch_click(*self.views[index].to_local(x, y))
+    
+    def _route_move(self, event, x, y, flags, param):
+        index = self._view_at(x, y)
+        if index is not None:
+            self.views[index].dispatch_move(*self.views[index].to_local(x, y))
+    
+    def setup(self):
+        """Create the window, set up every session and start inference
+        
+        Returns:
+            bool: Whether the server loop can run
+        """
+        if not self.window.create():
+            print("Unable to create window, server exiting")
+            return False
+        
+        for game in self.games:
+            game.setup()
+        self.inference.start()
+        self.running = True
+        return True
+    
+    def run_frame(self):
+        """Run one frame of every session and show the grid"""
+        for game in self.games:
+            if game.running:
+                game.run_frame()
+        
+        self.window.show(self.grid)
+        key = self.window.wait_key(1)
+        if key == 27:  # ESC key exits all sessions
+            self.running = False
+        elif key != -1:
+            self.views[self.focused].last_key = key
+        
+        if not any(game.running for game in self.games):
+            self.running = False
+    
+    def run(self):
+        """Run the server loop"""
+        if not self.setup():
+            return
+        
+        try:
+            while self.running:
+                self.run_frame()
+        finally:
+            self._cleanup()
+    
+    def _cleanup(self):
+        """Release all sessions and the window"""
+        self.inference.stop()
+        for game in self.games:
+            game._cleanup()
+        self.window.destroy()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Object Hunter multi-session server")
+    parser.add_argument("--source", action="append", default=None,
+                        help="Camera index, video file, image directory or 'procedural' (repeat per session)")
+    parser.add_argument("--sessions", type=int, default=None,
+                        help="Number of sessions, repeating the last source (default: one per source)")
+    parser.add_argument("--max-batch", type=int, default=None, help="Batch size limit")
+    parser.add_argument("--max-wait", type=float, default=None, help="Batch latency cap in seconds")
+    parser.add_argument("--model", default=None, help="Model weights (default: PATHS['model'])")
+    args = parser.parse_args()
+    
+    if args.model:
+        PATHS["model"] = args.model
+    
+    sources = args.source or ["0"]
+    if args.sessions:
+        sources = (sources + [sources[-1]] * args.sessions)[:args.sessions]
+    
+    server = GameServer(sources, args.max_batch, args.max_wait)
+    server.run()
+    
+    stats = server.inference.get_stats()
+    print(f"Inference batches: {stats['batches']}, mean batch size {stats['mean_batch_size']:.2f}, "
+          f"latency {stats['batch_latency'] * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
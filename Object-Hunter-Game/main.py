@@ -7,28 +7,73 @@ import random
 import time
 import os
 import pygame
-import math
 from object_detector import ObjectDetector
+from process_detector import ProcessDetector
 from config import (
-    WINDOW_NAME, CAMERA_WIDTH, CAMERA_HEIGHT, 
+    WINDOW_NAME, CAMERA_WIDTH, CAMERA_HEIGHT, CAMERA_INDEX, CAMERA_THREADED,
     TARGET_OBJECTS, GAME_TIME_SECONDS, DIFFICULTY_LEVELS,
     get_random_prompt, MENU, UI, COLORS,
-    ANIMATION, SOUNDS, OBJECTS
+    ANIMATION, SOUNDS, OBJECTS, DETECTION, PROFILER
 )
 from direct_camera import DirectCamera
 from pygame_window import PygameWindow
+from ui_cache import GradientCache, GlassPanelCache, TextSpriteCache, StaticLayerCache
+from particle_system import ParticleSystem
+from profiler import FrameProfiler
+from frame_pool import FramePool
+from transition import Transition
 
 class Game:
     """Game main class"""
     
-    def __init__(self):
-        """Initialize game"""
+    def __init__(self, detector=None, camera_factory=None, window=None):
+        """Initialize game
+        
+        Args:
+            detector: Object detector to use, a new ObjectDetector if None
+            camera_factory: Callable returning a camera object (DirectCamera interface),
+                            used instead of the webcam, e.g. by the benchmark harness
+            window: Window to render into (PygameWindow interface), a new PygameWindow if None
+        """
         # Initialize components
-        self.detector = ObjectDetector()
-        self.window = PygameWindow(WINDOW_NAME, CAMERA_WIDTH, CAMERA_HEIGHT)
+        # 模型在后台线程中加载和预热，菜单可以立即显示
+        if detector is None:
+            if DETECTION.get("inference_worker") == "process":
+                # 推理在独立进程中运行，帧通过共享内存传递，不与绘制争用GIL
+                detector = ProcessDetector(load_in_background=True)
+            else:
+                detector = ObjectDetector(load_in_background=True)
+        self.detector = detector
+        self.camera_factory = camera_factory
+        if DETECTION["async_inference"]:
+            # 在后台线程中运行推理，渲染循环不再被YOLO阻塞
+            self.detector.start_async()
+        self.window = window if window is not None else PygameWindow(WINDOW_NAME, CAMERA_WIDTH, CAMERA_HEIGHT)
         self.camera = None
         self.running = False
         
+        # 菜单过渡由主循环逐帧推进，不再阻塞
+        self.transition = Transition(UI["transition_time"])
+        
+        # 复用的帧缓冲（采集、镜像、占位黑帧），稳态下每帧不再分配内存
+        self.frame_pool = FramePool()
+        
+        # 缓存的UI资源
+        self.gradient_cache = GradientCache()
+        self.glass_cache = GlassPanelCache(self.draw_rounded_rect)
+        self.text_cache = TextSpriteCache()
+        self.menu_layers = StaticLayerCache()
+        self.hud_button_layers = StaticLayerCache(max_entries=8)
+        self._hud_text_key = None   # 顶部栏文本只在分数、秒数或目标变化时重新排版
+        self._hud_text = []
+        
+        # 性能分析（默认关闭，按键可打开HUD）
+        self.profiler = FrameProfiler(PROFILER["enabled"], PROFILER["window"])
+        self.profiler_export_path = PROFILER["export_path"]   # 退出时写入的统计文件，None表示不导出
+        self.profiler_hud_key = None
+        self.detect_time = 0          # 本帧detect_objects耗时，不计入调度器的渲染耗时
+        self.last_result_frame_id = 0
+        
         # 初始化所有游戏变量
         self._initialize_game_variables()
         
@@ -74,8 +119,8 @@ class Game:
         # Animation states
         self.button_hover = None
         self.button_click_animation = {}
-        self.celebration_particles = []
         self.particle_lifetime = ANIMATION["particle_lifetime"]
+        self.particles = ParticleSystem(lifetime=self.particle_lifetime)
         self.title_animation = 0.5   # 标题动画状态
         self.float_offset = 0      # 浮动偏移
         
@@ -204,176 +249,13 @@ class Game:
         else:
             print(f"Warning: Sound not found: {sound_name}")
     
-    def create_particle(self, x, y, color):
-        """创建更高级的粒子效果"""
-        # 随机选择粒子类型
-        particle_type = random.choice(["circle", "star", "sparkle", "triangle"])
-        
-        # 根据粒子类型设置不同参数
-        if particle_type == "circle":
-            size = random.uniform(3, 8)
-            velocity = (random.uniform(-3, 3), random.uniform(-5, -1))
-            acceleration = (0, 0.1)  # 向下的重力
-            decay_rate = random.uniform(0.95, 0.99)  # 速度衰减率
-        elif particle_type == "star":
-            size = random.uniform(4, 10)
-            velocity = (random.uniform(-2, 2), random.uniform(-4, -0.5))
-            acceleration = (0, 0.05)
-            decay_rate = random.uniform(0.97, 0.99)
-        elif particle_type == "sparkle":
-            size = random.uniform(1, 3)
-            velocity = (random.uniform(-4, 4), random.uniform(-4, 4))
-            acceleration = (0, 0.02)
-            decay_rate = random.uniform(0.9, 0.95)
-        else:  # triangle
-            size = random.uniform(4, 8)
-            velocity = (random.uniform(-3, 3), random.uniform(-3, -0.5))
-            acceleration = (0, 0.07)
-            decay_rate = random.uniform(0.96, 0.98)
-            
-        # 随机调整颜色亮度
-        brightness = random.uniform(0.7, 1.3)
-        bright_color = tuple(min(255, int(c * brightness)) for c in color)
-        
-        return {
-            "x": x,
-            "y": y,
-            "color": bright_color,
-            "velocity": velocity,
-            "acceleration": acceleration,
-            "size": size,
-            "type": particle_type,
-            "lifetime": self.particle_lifetime,
-            "created_time": time.time(),
-            "alpha": 255,  # 初始透明度
-            "decay_rate": decay_rate,
-            "rotation": random.uniform(0, 360),  # 初始旋转角度
-            "rotation_speed": random.uniform(-5, 5)  # 旋转速度
-        }
-    
     def update_particles(self):
         """更新粒子位置、速度和生命周期"""
-        current_time = time.time()
-        
-        # 过滤掉生命周期结束的粒子
-        self.celebration_particles = [
-            particle for particle in self.celebration_particles
-            if current_time - particle["created_time"] < particle["lifetime"]
-        ]
-        
-        for particle in self.celebration_particles:
-            # 更新位置
-            particle["x"] += particle["velocity"][0]
-            particle["y"] += particle["velocity"][1]
-            
-            # 应用加速度
-            particle["velocity"] = (
-                particle["velocity"][0] + particle["acceleration"][0],
-                particle["velocity"][1] + particle["acceleration"][1]
-            )
-            
-            # 应用速度衰减
-            particle["velocity"] = (
-                particle["velocity"][0] * particle["decay_rate"],
-                particle["velocity"][1] * particle["decay_rate"]
-            )
-            
-            # 更新透明度
-            age_ratio = (current_time - particle["created_time"]) / particle["lifetime"]
-            particle["alpha"] = int(255 * (1 - age_ratio))
-            
-            # 更新旋转角度
-            particle["rotation"] += particle["rotation_speed"]
-            
-            # 根据粒子类型缩小尺寸
-            if particle["type"] == "sparkle":
-                # 闪烁效果
-                particle["size"] *= 0.98
-            else:
-                # 缓慢缩小效果
-                particle["size"] *= 0.995
+        self.particles.update()
     
     def draw_particles(self, frame):
         """绘制更高级的粒子效果"""
-        for particle in self.celebration_particles:
-            # 获取粒子信息
-            x, y = int(particle["x"]), int(particle["y"])
-            size = int(particle["size"])
-            particle_type = particle["type"]
-            color = particle["color"]
-            alpha = particle["alpha"]
-            rotation = particle["rotation"]
-            
-            # 调整颜色，添加alpha通道
-            color_with_alpha = (*color, alpha)
-            
-            # 确保粒子在画面内
-            if x < 0 or y < 0 or x >= frame.shape[1] or y >= frame.shape[0]:
-                continue
-            
-            # 根据粒子类型绘制不同形状
-            if particle_type == "circle":
-                # 绘制圆形粒子
-                cv2.circle(frame, (x, y), size, color, -1, cv2.LINE_AA)
-                
-                # 添加光晕效果
-                for i in range(1, 4):
-                    glow_alpha = alpha // (i * 2)
-                    glow_size = size + i * 2
-                    glow_color = (*color[:3], glow_alpha)
-                    cv2.circle(frame, (x, y), glow_size, glow_color, 1, cv2.LINE_AA)
-                    
-            elif particle_type == "star":
-                # 绘制星形粒子
-                points = 5
-                outer_radius = size
-                inner_radius = size // 2
-                
-                # 计算星形点
-                star_points = []
-                for i in range(points * 2):
-                    # 交替使用内外半径
-                    radius = outer_radius if i % 2 == 0 else inner_radius
-                    angle = math.pi * i / points + math.radians(rotation)
-                    px = x + int(radius * math.cos(angle))
-                    py = y + int(radius * math.sin(angle))
-                    star_points.append([px, py])
-                
-                # 绘制填充星形
-                cv2.fillPoly(frame, [np.array(star_points)], color, cv2.LINE_AA)
-                
-            elif particle_type == "sparkle":
-                # 闪烁效果
-                brightness = random.uniform(0.7, 1.0)
-                sparkle_color = tuple(min(255, int(c * brightness)) for c in color)
-                
-                # 绘制中心点
-                cv2.circle(frame, (x, y), size, sparkle_color, -1, cv2.LINE_AA)
-                
-                # 绘制射线
-                for i in range(4):
-                    angle = math.pi * i / 2 + math.radians(rotation)
-                    ray_length = int(size * 3)
-                    end_x = x + int(ray_length * math.cos(angle))
-                    end_y = y + int(ray_length * math.sin(angle))
-                    cv2.line(frame, (x, y), (end_x, end_y), sparkle_color, 1, cv2.LINE_AA)
-                    
-            elif particle_type == "triangle":
-                # 绘制三角形
-                side = size * 2
-                height = int(side * math.sqrt(3) / 2)
-                
-                # 计算三角形三个顶点
-                angle = math.radians(rotation)
-                points = []
-                for i in range(3):
-                    point_angle = angle + math.pi * 2 * i / 3
-                    px = x + int(side * math.cos(point_angle))
-                    py = y + int(side * math.sin(point_angle))
-                    points.append([px, py])
-                
-                # 绘制填充三角形
-                cv2.fillPoly(frame, [np.array(points)], color, cv2.LINE_AA)
+        self.particles.draw(frame)
     
     def draw_button(self, frame, button_name, button):
         """Draw a button with hover and click effects"""
@@ -414,10 +296,79 @@ class Game:
         cv2.rectangle(frame, (x1, y1), (x2, y2), (255, 255, 255), 2)
         
         # Draw button text
-        text_size = cv2.getTextSize(button["text"], cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)[0]
+        text_size = self.text_cache.measure(button["text"], 0.6, 2)
         text_x = x1 + (x2 - x1 - text_size[0]) // 2
         text_y = y1 + (y2 - y1 + text_size[1]) // 2
-        cv2.putText(frame, button["text"], (text_x, text_y), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 2)
+        self.text_cache.draw(frame, button["text"], (text_x, text_y), 0.6, (0, 0, 0), 2)
+    
+    def _hud_text_layout(self, w, topbar_height, padding):
+        """Top bar strings and their positions
+        
+        Rebuilt only when the target, the score or the displayed seconds
+        change; every other frame reuses the list and the cached sprites.
+        
+        Returns:
+            list: (text, origin) pairs
+        """
+        # 时间格式化为分:秒
+        minutes = int(self.time_remaining // 60)
+        seconds = int(self.time_remaining % 60)
+        key = (w, topbar_height, padding, self.current_target, self.score, minutes, seconds)
+        if key == self._hud_text_key:
+            return self._hud_text
+        
+        text_y = int(topbar_height // 2 + 10)
+        layout = []
+        
+        # 目标对象
+        if self.current_target:
+            layout.append((f"Find: {self.current_target}", (padding, text_y)))
+        
+        # 分数和时间放到右侧
+        score_text = f"Score: {self.score}"
+        score_size = self.text_cache.measure(score_text, 0.8, 2)
+        score_x = w - score_size[0] - padding
+        layout.append((score_text, (score_x, text_y)))
+        
+        time_text = f"Time: {minutes:01d}:{seconds:02d}"
+        time_size = self.text_cache.measure(time_text, 0.8, 2)
+        layout.append((time_text, (score_x - time_size[0] - padding, text_y)))
+        
+        self._hud_text_key = key
+        self._hud_text = layout
+        return layout
+    
+    def _draw_hud_button(self, frame, button_name, text, rect):
+        """Draw a bottom bar button from a cached layer
+        
+        The glass button is rendered once per (button, hover, pressed, size)
+        and composited over the live frame, instead of blurring and
+        redrawing it every frame.
+        """
+        # 点击动画结束后清除记录，与draw_modern_button一致
+        click_time = self.button_click_animation.get(button_name)
+        pressed = click_time is not None and time.time() - click_time < ANIMATION["button_click_duration"]
+        if click_time is not None and not pressed:
+            del self.button_click_animation[button_name]
+        
+        # 多留出边框的像素
+        pad = 2
+        x1, y1, x2, y2 = rect
+        h, w = frame.shape[:2]
+        left, top = max(0, x1 - pad), max(0, y1 - pad)
+        roi = frame[top:min(h, y2 + pad), left:min(w, x2 + pad)]
+        if roi.size == 0:
+            return
+        
+        button = {
+            "text": text,
+            "coords": (x1 - left, y1 - top, x2 - left, y2 - top),
+            "color": COLORS["button_normal"],
+            "hover_color": COLORS["button_hover"],
+            "active": True
+        }
+        key = (button_name, text, button_name == self.button_hover, pressed)
+        self.hud_button_layers.draw(roi, key, lambda layer: self.draw_modern_button(layer, button_name, button))
     
     def draw_game(self, frame):
         """Draw modern style game interface"""
@@ -443,7 +394,8 @@ class Game:
                                COLORS["panel"], 
                                alpha=0.6,  # 降低不透明度
                                blur=UI["blur_amount"], 
-                               border_radius=0)
+                               border_radius=0,
+                               blur_scale=UI["hud_blur_scale"])
         
         # 绘制半透明底部状态栏
         bottombar_rect = (0, h - bottombar_height, w, h)
@@ -452,7 +404,8 @@ class Game:
                                COLORS["panel"], 
                                alpha=0.6,  # 降低不透明度
                                blur=UI["blur_amount"], 
-                               border_radius=0)
+                               border_radius=0,
+                               blur_scale=UI["hud_blur_scale"])
         
         # 计算时间进度条
         time_progress = max(0.0, min(1.0, self.time_remaining / self.difficulty_time))
@@ -473,45 +426,22 @@ class Game:
                     (progress_width, topbar_height + progress_height),
                     progress_color, -1)
         
-        # 绘制游戏信息 - 目标、分数和时间
+        # 绘制游戏信息 - 目标、分数和时间（文本和位置只在内容变化时重新计算）
         padding = 20
-        
-        # 目标对象
-        if self.current_target:
-            target_text = f"Find: {self.current_target}"
-            cv2.putText(frame, target_text, 
-                      (padding, int(topbar_height // 2 + 10)),
-                      cv2.FONT_HERSHEY_SIMPLEX, 0.8, COLORS["white"], 2, cv2.LINE_AA)
-        
-        # 分数和时间放到右侧
-        score_text = f"Score: {self.score}"
-        score_size = cv2.getTextSize(score_text, cv2.FONT_HERSHEY_SIMPLEX, 0.8, 2)[0]
-        score_x = w - score_size[0] - padding
-        cv2.putText(frame, score_text, 
-                  (score_x, int(topbar_height // 2 + 10)),
-                  cv2.FONT_HERSHEY_SIMPLEX, 0.8, COLORS["white"], 2, cv2.LINE_AA)
-        
-        # 时间格式化为分:秒
-        minutes = int(self.time_remaining // 60)
-        seconds = int(self.time_remaining % 60)
-        time_text = f"Time: {minutes:01d}:{seconds:02d}"
-        time_size = cv2.getTextSize(time_text, cv2.FONT_HERSHEY_SIMPLEX, 0.8, 2)[0]
-        time_x = score_x - time_size[0] - padding
-        cv2.putText(frame, time_text, 
-                  (time_x, int(topbar_height // 2 + 10)),
-                  cv2.FONT_HERSHEY_SIMPLEX, 0.8, COLORS["white"], 2, cv2.LINE_AA)
+        for text, org in self._hud_text_layout(w, topbar_height, padding):
+            self.text_cache.draw(frame, text, org, 0.8, COLORS["white"], 2, cv2.LINE_AA)
         
         # 控制按钮放在底部状态栏
         # 计算按钮位置
         next_text = "Next"
-        next_size = cv2.getTextSize(next_text, cv2.FONT_HERSHEY_SIMPLEX, 0.9, 2)[0]
+        next_size = self.text_cache.measure(next_text, 0.9, 2)
         next_width = next_size[0] + 40
         next_height = next_size[1] + 20
         next_x = w - next_width - padding
         next_y = h - bottombar_height + (bottombar_height - next_height) // 2
         
         quit_text = "Quit"
-        quit_size = cv2.getTextSize(quit_text, cv2.FONT_HERSHEY_SIMPLEX, 0.9, 2)[0]
+        quit_size = self.text_cache.measure(quit_text, 0.9, 2)
         quit_width = quit_size[0] + 40
         quit_height = quit_size[1] + 20
         quit_x = next_x - quit_width - padding
@@ -536,27 +466,14 @@ class Game:
         self.buttons["next"] = next_button_rect
         self.buttons["quit"] = quit_button_rect
         
-        # 绘制按钮
-        self.draw_modern_button(frame, "next", {
-            "text": "Next", 
-            "coords": self.buttons["next"],
-            "color": COLORS["button_normal"],
-            "hover_color": COLORS["button_hover"],
-            "active": True
-        })
-        
-        self.draw_modern_button(frame, "quit", {
-            "text": "Quit", 
-            "coords": self.buttons["quit"],
-            "color": COLORS["button_normal"],
-            "hover_color": COLORS["button_hover"],
-            "active": True
-        })
+        # 绘制按钮（缓存的按钮图层，悬停或点击状态变化时才重绘）
+        self._draw_hud_button(frame, "next", "Next", self.buttons["next"])
+        self._draw_hud_button(frame, "quit", "Quit", self.buttons["quit"])
         
         # 在Hard模式下显示剩余Next点击次数
         if self.difficulty == "hard" and not self.game_over:
             next_text = f"Next clicks: {self.next_clicks_remaining}"
-            next_size = cv2.getTextSize(next_text, cv2.FONT_HERSHEY_SIMPLEX, 0.8, 2)[0]
+            next_size = self.text_cache.measure(next_text, 0.8, 2)
             next_x = int(next_x - next_size[0] - 20)
             next_y = int(next_y - next_height - 15)
             
@@ -578,8 +495,8 @@ class Game:
                                    border_radius=UI["corner_radius"]//2)
             
             # 绘制文本
-            cv2.putText(frame, next_text, (next_x, next_y), 
-                      cv2.FONT_HERSHEY_SIMPLEX, 0.8, COLORS["white"], 2, cv2.LINE_AA)
+            self.text_cache.draw(frame, next_text, (next_x, next_y), 
+                      0.8, COLORS["white"], 2, cv2.LINE_AA)
         
         # Update and draw particle effects
         self.update_particles()
@@ -614,7 +531,7 @@ class Game:
             
             # 绘制标题
             title = "Game Over"
-            title_size = cv2.getTextSize(title, cv2.FONT_HERSHEY_SIMPLEX, 2.0, 3)[0]
+            title_size = self.text_cache.measure(title, 2.0, 3)
             cv2.putText(frame, title,
                       (int(CAMERA_WIDTH//2 - title_size[0]//2), int(panel_y1 + 80)),
                       cv2.FONT_HERSHEY_SIMPLEX, 2.0, 
@@ -622,7 +539,7 @@ class Game:
             
             # 绘制分数
             score_text = f"Final Score: {self.score}"
-            score_size = cv2.getTextSize(score_text, cv2.FONT_HERSHEY_SIMPLEX, 1.5, 2)[0]
+            score_size = self.text_cache.measure(score_text, 1.5, 2)
             cv2.putText(frame, score_text,
                       (int(CAMERA_WIDTH//2 - score_size[0]//2), int(panel_y1 + 150)),
                       cv2.FONT_HERSHEY_SIMPLEX, 1.5, 
@@ -634,7 +551,7 @@ class Game:
                 
                 # 创建"Play Again"按钮
                 restart_text = "Play Again"
-                restart_size = cv2.getTextSize(restart_text, cv2.FONT_HERSHEY_SIMPLEX, 1.0, 2)[0]
+                restart_size = self.text_cache.measure(restart_text, 1.0, 2)
                 restart_button_w = restart_size[0] + 40
                 restart_button_h = restart_size[1] + 20
                 restart_button_x = int(CAMERA_WIDTH//2 - restart_button_w - 20)
@@ -679,7 +596,7 @@ class Game:
                 
                 # 创建"Main Menu"按钮
                 menu_text = "Main Menu"
-                menu_size = cv2.getTextSize(menu_text, cv2.FONT_HERSHEY_SIMPLEX, 1.0, 2)[0]
+                menu_size = self.text_cache.measure(menu_text, 1.0, 2)
                 menu_button_w = menu_size[0] + 40
                 menu_button_h = menu_size[1] + 20
                 menu_button_x = int(CAMERA_WIDTH//2 + 20)
@@ -770,20 +687,20 @@ class Game:
                                border_radius=UI["corner_radius"])
         
         # Draw button text
-        text_size = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 0.9, 2)[0]
+        text_size = self.text_cache.measure(text, 0.9, 2)
         text_x = int(x1 + (x2 - x1 - text_size[0]) // 2)
         text_y = int(y1 + (y2 - y1 + text_size[1]) // 2)
         
         # Draw text shadow
         shadow_offset = 2
-        cv2.putText(frame, text, 
+        self.text_cache.draw(frame, text, 
                   (int(text_x + shadow_offset), int(text_y + shadow_offset)), 
-                  cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 0, 0), 2, cv2.LINE_AA)
+                  0.9, (0, 0, 0), 2, cv2.LINE_AA)
         
         # Draw main text
-        cv2.putText(frame, text, 
+        self.text_cache.draw(frame, text, 
                   (text_x, text_y), 
-                  cv2.FONT_HERSHEY_SIMPLEX, 0.9, COLORS["white"], 2, cv2.LINE_AA)
+                  0.9, COLORS["white"], 2, cv2.LINE_AA)
     
     def draw_menu(self, frame):
         """Draw modern main menu interface"""
@@ -792,72 +709,44 @@ class Game:
         center_x = w // 2
         center_y = h // 2
         
-        # Add background gradient
-        self.create_gradient(frame, (0, 0, w, h), 
-                            COLORS["bg_gradient_top"], 
-                            COLORS["bg_gradient_bottom"], 
-                            vertical=True)
+        # 静态部分（背景、面板、选项、退出按钮、提示）按状态缓存，悬停或选中变化时才重绘，每帧叠加在摄像头画面上
+        layer_key = ("main", self.selected_option, self.button_hover, self.detector.state)
+        buttons = self.menu_layers.draw(frame, layer_key, self._draw_menu_layer)
+        self.buttons.update(buttons)
         
         # Calculate time-based animations
         current_time = time.time()
         self.title_animation = 0.5 + 0.5 * np.sin(current_time * ANIMATION["pulse_speed"] * 0.5)
         self.float_offset = ANIMATION["float_amount"] * np.sin(current_time * 1.5)
-        
-        # Create semi-transparent center panel
         panel_width = w * 0.7
-        panel_height = h * 0.75
-        panel_x1 = center_x - panel_width // 2
-        panel_y1 = center_y - panel_height // 2
-        panel_rect = (int(panel_x1), int(panel_y1), 
-                      int(panel_x1 + panel_width), int(panel_y1 + panel_height))
-        
-        # Create glass effect panel
-        self.create_glass_effect(frame, panel_rect, COLORS["panel"], 
-                               alpha=0.7, blur=UI["blur_amount"], 
-                               border_radius=UI["corner_radius"])
         
         # Draw title (with floating animation effect)
         title = MENU["title"]
-        title_size = cv2.getTextSize(title, cv2.FONT_HERSHEY_SIMPLEX, 2.0, 4)[0]
+        title_size = self.text_cache.measure(title, 2.0, 4)
         # 更高的位置，确保不与下面元素重叠
         title_y = int(center_y - 200 + int(self.float_offset))
         
-        # Draw glow effect
+        # Draw title with glow effect (pre-rendered sprite, glow colors are quantized by the cache)
         glow_size = int(UI["glow_radius"] * self.title_animation)
-        for i in range(glow_size, 0, -1):
-            alpha = int(255 * (1 - i / glow_size) * 0.7)
-            color = (
-                int(COLORS["text_glow"][0] * self.title_animation),
-                int(COLORS["text_glow"][1] * self.title_animation),
-                int(COLORS["text_glow"][2] * self.title_animation)
-            )
-            
-            # Draw outer glow
-            cv2.putText(frame, title,
-                      (int(center_x - title_size[0]//2 + i), title_y),
-                      cv2.FONT_HERSHEY_SIMPLEX, 2.0, color, 4, cv2.LINE_AA)
-            cv2.putText(frame, title,
-                      (int(center_x - title_size[0]//2 - i), title_y),
-                      cv2.FONT_HERSHEY_SIMPLEX, 2.0, color, 4, cv2.LINE_AA)
-        
-        # Draw title
-        cv2.putText(frame, title,
-                  (int(center_x - title_size[0]//2), title_y),
-                  cv2.FONT_HERSHEY_SIMPLEX, 2.0, COLORS["white"], 4, cv2.LINE_AA)
+        glow_color = tuple(int(c * self.title_animation) for c in COLORS["text_glow"])
+        self.text_cache.draw(frame, title,
+                             (int(center_x - title_size[0]//2), title_y),
+                             2.0, COLORS["white"], 4, cv2.LINE_AA,
+                             glow=glow_size, glow_color=glow_color)
         
         # Draw version number
         version = MENU["version"]
-        version_size = cv2.getTextSize(version, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 1)[0]
-        cv2.putText(frame, version,
+        version_size = self.text_cache.measure(version, 0.6, 1)
+        self.text_cache.draw(frame, version,
                   (int(center_x + title_size[0]//2 - version_size[0]), title_y - title_size[1] + version_size[1]),
-                  cv2.FONT_HERSHEY_SIMPLEX, 0.6, COLORS["gray"], 1, cv2.LINE_AA)
+                  0.6, COLORS["gray"], 1, cv2.LINE_AA)
         
         # Draw subtitle
         subtitle = "Modern Object Recognition Game"
-        subtitle_size = cv2.getTextSize(subtitle, cv2.FONT_HERSHEY_SIMPLEX, 0.9, 2)[0]
-        cv2.putText(frame, subtitle,
+        subtitle_size = self.text_cache.measure(subtitle, 0.9, 2)
+        self.text_cache.draw(frame, subtitle,
                   (int(center_x - subtitle_size[0]//2), int(title_y + 50)),
-                  cv2.FONT_HERSHEY_SIMPLEX, 0.9, COLORS["gray"], 2, cv2.LINE_AA)
+                  0.9, COLORS["gray"], 2, cv2.LINE_AA)
         
         # Draw separator line
         line_y = int(title_y + 80)
@@ -867,6 +756,39 @@ class Game:
                 (int(center_x + line_width//2), line_y),
                 COLORS["accent_2"], 2, cv2.LINE_AA)
         
+        # 模型未就绪时显示加载状态
+        if not self.detector.is_ready():
+            self.draw_loading_indicator(frame, center_x, line_y + 40)
+    
+    def _draw_menu_layer(self, frame):
+        """Draw the static part of the main menu
+        
+        Returns:
+            dict: Button rects placed on the layer, for click detection
+        """
+        h, w = frame.shape[:2]
+        center_x = w // 2
+        center_y = h // 2
+        
+        # Add background gradient
+        self.create_gradient(frame, (0, 0, w, h), 
+                            COLORS["bg_gradient_top"], 
+                            COLORS["bg_gradient_bottom"], 
+                            vertical=True)
+        
+        # Create semi-transparent center panel
+        panel_width = w * 0.7
+        panel_height = h * 0.75
+        panel_x1 = center_x - panel_width // 2
+        panel_y1 = center_y - panel_height // 2
+        panel_rect = (int(panel_x1), int(panel_y1), 
+                      int(panel_x1 + panel_width), int(panel_y1 + panel_height))
+        
+        # Create glass effect panel
+        self.create_glass_effect(frame, panel_rect, COLORS["panel"], 
+                               alpha=0.7, blur=UI["blur_amount"], 
+                               border_radius=UI["corner_radius"])
+        
         # 过滤菜单选项，删除"Exit Game"
         filtered_options = [option for option in MENU["main_options"] if option["action"] != "quit"]
         
@@ -879,7 +801,7 @@ class Game:
             y_pos = int(start_y + i * spacing)
             
             # Calculate option size
-            text_size = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 1.1, 2)[0]
+            text_size = self.text_cache.measure(text, 1.1, 2)
             option_width = text_size[0] + UI["menu_padding"] * 2
             option_height = text_size[1] + UI["menu_padding"]
             
@@ -891,8 +813,16 @@ class Game:
             
             option_rect = (rect_x1, rect_y1, rect_x2, rect_y2)
             
+            # 模型就绪前禁用Start Game按钮
+            if option["action"] == "start" and not self.detector.is_ready():
+                self.create_glass_effect(frame, option_rect, 
+                                       (*COLORS["button_disabled"], 150), 
+                                       alpha=0.6, blur=UI["blur_amount"] // 2, 
+                                       border_radius=UI["corner_radius"])
+                
+                text_color = COLORS["gray"]
             # Current selected option has a different style
-            if i == self.selected_option:
+            elif i == self.selected_option:
                 # Draw selected button with glass effect
                 self.create_glass_effect(frame, option_rect, COLORS["accent_2"], 
                                        alpha=0.8, blur=UI["blur_amount"] // 2, 
@@ -915,13 +845,13 @@ class Game:
                 text_color = COLORS["white"]
             
             # Draw option text
-            cv2.putText(frame, text,
+            self.text_cache.draw(frame, text,
                       (int(center_x - text_size[0]//2), int(y_pos + text_size[1]//2)),
-                      cv2.FONT_HERSHEY_SIMPLEX, 1.1, text_color, 2, cv2.LINE_AA)
+                      1.1, text_color, 2, cv2.LINE_AA)
         
         # 添加Exit Game按钮（替换Close按钮）
         exit_text = "Exit Game"
-        exit_size = cv2.getTextSize(exit_text, cv2.FONT_HERSHEY_SIMPLEX, 0.9, 2)[0]
+        exit_size = self.text_cache.measure(exit_text, 0.9, 2)
         exit_button_w = exit_size[0] + 40
         exit_button_h = exit_size[1] + 20
         exit_button_x = int(panel_x1 + panel_width - exit_button_w - 20)
@@ -945,30 +875,27 @@ class Game:
         )
         
         # 绘制按钮文本
-        cv2.putText(
+        self.text_cache.draw(
             frame, 
             exit_text,
             (int(exit_button_x + (exit_button_w - exit_size[0])//2), 
              int(exit_button_y + (exit_button_h + exit_size[1])//2 - 2)),
-            cv2.FONT_HERSHEY_SIMPLEX, 
             0.9, 
             COLORS["white"], 
             2, 
             cv2.LINE_AA
         )
         
-        # 存储Exit Game按钮位置供点击检测
-        self.buttons["exit_game"] = exit_button_rect
         
         # Draw bottom instruction
         instruction = "Click on an option to select"
-        instruction_size = cv2.getTextSize(instruction, cv2.FONT_HERSHEY_SIMPLEX, 0.7, 1)[0]
+        instruction_size = self.text_cache.measure(instruction, 0.7, 1)
         
         instruction_y = int(panel_y1 + panel_height - 30)
         
-        cv2.putText(frame, instruction,
+        self.text_cache.draw(frame, instruction,
                   (int(center_x - instruction_size[0]//2), instruction_y),
-                  cv2.FONT_HERSHEY_SIMPLEX, 0.7, COLORS["gray"], 1, cv2.LINE_AA)
+                  0.7, COLORS["gray"], 1, cv2.LINE_AA)
                   
         # Add bottom decoration
         decoration_y = int(instruction_y + 15)
@@ -980,6 +907,32 @@ class Game:
                (int(center_x - decoration_width), decoration_y), 
                (int(center_x + decoration_width), decoration_y), 
                COLORS["accent_1"], 2)
+        
+        # 存储Exit Game按钮位置供点击检测
+        return {"exit_game": exit_button_rect}
+    
+    def draw_loading_indicator(self, frame, center_x, y):
+        """Draw the model loading status with a spinner"""
+        state = self.detector.state
+        if state == "failed":
+            text = "Detection model failed to load"
+            color = COLORS["danger"]
+        else:
+            text = "Loading detection model" if state == "loading" else "Warming up detection model"
+            text += "." * (int(time.time() * 2) % 4)
+            color = COLORS["gray"]
+        
+        # 文本宽度按不带省略号的长度计算，避免文字随动画左右跳动
+        text_size = self.text_cache.measure(text.rstrip("."), 0.7, 1)
+        text_x = int(center_x - text_size[0] // 2 + 15)
+        self.text_cache.draw(frame, text, (text_x, int(y + text_size[1] // 2)),
+                  0.7, color, 1, cv2.LINE_AA)
+        
+        # 旋转的加载圆弧
+        if state != "failed":
+            angle = int(time.time() * 360) % 360
+            cv2.ellipse(frame, (text_x - 20, int(y)), (10, 10), angle, 0, 270,
+                      COLORS["accent_2"], 2, cv2.LINE_AA)
     
     def draw_difficulty_menu(self, frame):
         """Draw modern difficulty selection menu"""
@@ -988,17 +941,64 @@ class Game:
         center_x = w // 2
         center_y = h // 2
         
-        # Add background gradient effect
-        self.create_gradient(frame, (0, 0, w, h), 
-                            COLORS["bg_gradient_top"], 
-                            COLORS["bg_gradient_bottom"], 
-                            vertical=True)
+        # 静态部分（背景、面板、返回按钮、难度卡片、提示）按状态缓存
+        layer_key = ("difficulty", self.selected_option, self.button_hover)
+        buttons = self.menu_layers.draw(frame, layer_key, self._draw_difficulty_layer)
+        self.buttons.update(buttons)
         
         # Calculate animation effects
         current_time = time.time()
         pulse = 0.5 + 0.5 * np.sin(current_time * ANIMATION["pulse_speed"] * 0.3)
         float_offset = ANIMATION["float_amount"] * 0.5 * np.sin(current_time * 1.2)
         
+        panel_width = w * 0.7
+        panel_height = h * 0.8
+        panel_y1 = center_y - panel_height // 2
+        
+        # Draw title - 调整标题位置避免与选项重叠
+        title = "Select Difficulty"
+        title_size = self.text_cache.measure(title, 2.0, 4)
+        title_y = int(panel_y1 + 80 + int(float_offset))  # 将标题上移
+        
+        # Draw title with glow effect (pre-rendered sprite)
+        glow_color = tuple(int(c * pulse) for c in COLORS["text_glow"])
+        self.text_cache.draw(frame, title,
+                             (int(center_x - title_size[0]//2), title_y),
+                             2.0, COLORS["accent_2"], 4, cv2.LINE_AA,
+                             glow=UI["glow_radius"], glow_color=glow_color)
+        
+        # Draw description text
+        description = "Double-click to select a difficulty level"
+        desc_size = self.text_cache.measure(description, 0.8, 1)
+        self.text_cache.draw(frame, description,
+                  (int(center_x - desc_size[0]//2), int(title_y + 50)),
+                  0.8, COLORS["gray"], 1, cv2.LINE_AA)
+        
+        # Draw separator line
+        line_y = int(title_y + 80)
+        line_width = int(panel_width * 0.6)
+        cv2.line(frame, 
+                (int(center_x - line_width//2), line_y),
+                (int(center_x + line_width//2), line_y),
+                COLORS["accent_1"], 2, cv2.LINE_AA)
+    
+    def _draw_difficulty_layer(self, frame):
+        """Draw the static part of the difficulty menu
+        
+        Returns:
+            dict: Button rects placed on the layer, for click detection
+        """
+        h, w = frame.shape[:2]
+        center_x = w // 2
+        center_y = h // 2
+        buttons = {}
+        
+        # Add background gradient effect
+        self.create_gradient(frame, (0, 0, w, h), 
+                            COLORS["bg_gradient_top"], 
+                            COLORS["bg_gradient_bottom"], 
+                            vertical=True)
+        
         # Draw center panel - 增加panel高度确保所有内容都能显示
         panel_width = w * 0.7
         panel_height = h * 0.8  # 增加面板高度
@@ -1014,7 +1014,7 @@ class Game:
         
         # Draw back button (top left)
         back_text = "< Back"
-        back_size = cv2.getTextSize(back_text, cv2.FONT_HERSHEY_SIMPLEX, 0.8, 2)[0]
+        back_size = self.text_cache.measure(back_text, 0.8, 2)
         back_rect = (20, 20, 20 + back_size[0] + 20, 20 + back_size[1] + 10)
         
         # Create back button glass effect
@@ -1023,50 +1023,12 @@ class Game:
                                alpha=0.6, blur=3, border_radius=5)
         
         # Draw back button text
-        cv2.putText(frame, back_text,
+        self.text_cache.draw(frame, back_text,
                   (30, 20 + back_size[1]),
-                  cv2.FONT_HERSHEY_SIMPLEX, 0.8, COLORS["gray"], 2, cv2.LINE_AA)
-        
-        # Draw title - 调整标题位置避免与选项重叠
-        title = "Select Difficulty"
-        title_size = cv2.getTextSize(title, cv2.FONT_HERSHEY_SIMPLEX, 2.0, 4)[0]
-        title_y = int(panel_y1 + 80 + int(float_offset))  # 将标题上移
-        
-        # Draw title glow effect
-        glow_color = (
-            int(COLORS["text_glow"][0] * pulse),
-            int(COLORS["text_glow"][1] * pulse),
-            int(COLORS["text_glow"][2] * pulse)
-        )
-        
-        for i in range(UI["glow_radius"]):
-            offset = UI["glow_radius"] - i
-            cv2.putText(frame, title,
-                      (int(center_x - title_size[0]//2 + offset), title_y),
-                      cv2.FONT_HERSHEY_SIMPLEX, 2.0, glow_color, 4, cv2.LINE_AA)
-            cv2.putText(frame, title,
-                      (int(center_x - title_size[0]//2 - offset), title_y),
-                      cv2.FONT_HERSHEY_SIMPLEX, 2.0, glow_color, 4, cv2.LINE_AA)
-        
-        # Draw main title text
-        cv2.putText(frame, title,
-                  (int(center_x - title_size[0]//2), title_y),
-                  cv2.FONT_HERSHEY_SIMPLEX, 2.0, COLORS["accent_2"], 4, cv2.LINE_AA)
-        
-        # Draw description text
-        description = "Double-click to select a difficulty level"
-        desc_size = cv2.getTextSize(description, cv2.FONT_HERSHEY_SIMPLEX, 0.8, 1)[0]
-        cv2.putText(frame, description,
-                  (int(center_x - desc_size[0]//2), int(title_y + 50)),
-                  cv2.FONT_HERSHEY_SIMPLEX, 0.8, COLORS["gray"], 1, cv2.LINE_AA)
+                  0.8, COLORS["gray"], 2, cv2.LINE_AA)
         
-        # Draw separator line
-        line_y = int(title_y + 80)
-        line_width = int(panel_width * 0.6)
-        cv2.line(frame, 
-                (int(center_x - line_width//2), line_y),
-                (int(center_x + line_width//2), line_y),
-                COLORS["accent_1"], 2, cv2.LINE_AA)
+        # 卡片按标题不浮动时的分隔线位置布局，这样它们可以留在静态层里
+        line_y = int(panel_y1 + 80) + 80
         
         # Calculate difficulty options layout - 从线条下方开始布局选项
         diff_start_y = line_y + 70  # 从分隔线下方开始
@@ -1103,8 +1065,8 @@ class Game:
                 color = COLORS["warning"]  # Orange
             
             # Calculate text sizes - 稍微减小文字大小
-            text_size = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 1.0, 2)[0]
-            desc_size = cv2.getTextSize(desc, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 1)[0]
+            text_size = self.text_cache.measure(text, 1.0, 2)
+            desc_size = self.text_cache.measure(desc, 0.6, 1)
             
             # 使用统一大小的卡片
             card_x1 = int(center_x - card_width // 2)
@@ -1115,7 +1077,7 @@ class Game:
             card_rect = (card_x1, card_y1, card_x2, card_y2)
             
             # 添加到按钮列表，用于鼠标检测
-            self.buttons[f"difficulty_{value}"] = card_rect
+            buttons[f"difficulty_{value}"] = card_rect
             
             # Current selected option has special style
             if i == self.selected_option:
@@ -1139,14 +1101,14 @@ class Game:
                             icon_size//2, dot_color, -1, cv2.LINE_AA)
                 
                 # Draw difficulty name (large text) - 位置调整避免重叠
-                cv2.putText(frame, text,
+                self.text_cache.draw(frame, text,
                           (int(card_x1 + 80), int(card_y1 + 35)),
-                          cv2.FONT_HERSHEY_SIMPLEX, 1.0, COLORS["white"], 2, cv2.LINE_AA)
+                          1.0, COLORS["white"], 2, cv2.LINE_AA)
                 
                 # Draw difficulty description (small text) - 位置调整避免重叠
-                cv2.putText(frame, desc,
+                self.text_cache.draw(frame, desc,
                           (int(card_x1 + 80), int(card_y1 + 65)),
-                          cv2.FONT_HERSHEY_SIMPLEX, 0.6, COLORS["white"], 1, cv2.LINE_AA)
+                          0.6, COLORS["white"], 1, cv2.LINE_AA)
                 
             else:
                 # Create normal item transparent effect
@@ -1158,23 +1120,25 @@ class Game:
                                      UI["corner_radius"], 1)
                 
                 # Draw difficulty name - 位置调整避免重叠
-                cv2.putText(frame, text,
+                self.text_cache.draw(frame, text,
                           (int(card_x1 + 80), int(card_y1 + 35)),
-                          cv2.FONT_HERSHEY_SIMPLEX, 1.0, color, 2, cv2.LINE_AA)
+                          1.0, color, 2, cv2.LINE_AA)
                 
                 # Draw difficulty description - 位置调整避免重叠
-                cv2.putText(frame, desc,
+                self.text_cache.draw(frame, desc,
                           (int(card_x1 + 80), int(card_y1 + 65)),
-                          cv2.FONT_HERSHEY_SIMPLEX, 0.6, COLORS["gray"], 1, cv2.LINE_AA)
+                          0.6, COLORS["gray"], 1, cv2.LINE_AA)
         
         # 在底部添加提示文本 - 调整位置确保在面板内
         hint_text = "Double-click on an option to select and return to main menu"
-        hint_size = cv2.getTextSize(hint_text, cv2.FONT_HERSHEY_SIMPLEX, 0.7, 1)[0]
+        hint_size = self.text_cache.measure(hint_text, 0.7, 1)
         hint_y = int(panel_y1 + panel_height - 20)
         
-        cv2.putText(frame, hint_text,
+        self.text_cache.draw(frame, hint_text,
                   (int(center_x - hint_size[0]//2), hint_y),
-                  cv2.FONT_HERSHEY_SIMPLEX, 0.7, COLORS["accent_2"], 1, cv2.LINE_AA)
+                  0.7, COLORS["accent_2"], 1, cv2.LINE_AA)
+        
+        return buttons
     
     def handle_menu_input(self, event, x, y, flags=None, param=None):
         """Handle menu input interactions with animations"""
@@ -1195,10 +1159,7 @@ class Game:
                         self._play_sound("click")
                         
                         # Create particles
-                        for _ in range(10):
-                            self.celebration_particles.append(
-                                self.create_particle(x, y, COLORS["danger"])
-                            )
+                        self.particles.emit(x, y, COLORS["danger"], count=10)
                         
                         # Exit game
                         self.running = False
@@ -1219,14 +1180,15 @@ class Game:
                         self._play_sound("click")
                         
                         # Create particles at click point
-                        for _ in range(10):
-                            self.celebration_particles.append(
-                                self.create_particle(x, y, COLORS["accent_2"])
-                            )
+                        self.particles.emit(x, y, COLORS["accent_2"], count=10)
                         
                         # Handle option action
                         action = option["action"]
                         if action == "start":
+                            if not self.detector.is_ready():
+                                print("Detection model is not ready yet")
+                                self._play_sound("error")
+                                continue
                             print("Starting game from main menu...")
                             self.transition_to_game()
                         elif action == "settings":
@@ -1276,10 +1238,7 @@ class Game:
                             self._play_sound("difficulty_change")
                             
                             # 创建粒子效果
-                            for _ in range(15):
-                                self.celebration_particles.append(
-                                    self.create_particle(x, y, color)
-                                )
+                            self.particles.emit(x, y, color, count=15)
                             
                             # 添加视觉反馈，提示选择已生效
                             print(f"Difficulty selected: {difficulty_value}")
@@ -1296,10 +1255,7 @@ class Game:
         if self.last_click:
             x, y = self.last_click
             # 创建多个粒子效果
-            for _ in range(15):
-                self.celebration_particles.append(
-                    self.create_particle(x, y, COLORS["success"])
-                )
+            self.particles.emit(x, y, COLORS["success"], count=15)
         
         # 重要：直接设置游戏状态，而不仅仅是设置transition参数
         self.current_menu = "game"
@@ -1324,107 +1280,60 @@ class Game:
         print(f"Current target: {self.current_target}")
     
     def transition_to(self, from_menu, to_menu):
-        """Smooth transition to new menu interface"""
-        # Record start time
-        start_time = time.time()
-        duration = UI["transition_time"]  # Transition duration
+        """Start a smooth transition to a new menu interface
         
-        # Set transition animation frame rate
-        fps = 60
-        frame_time = 1.0 / fps
+        The transition is drawn by run_frame, so detection, timers and input
+        keep running while it plays.
+        """
+        # 上一个过渡还没结束时直接完成它
+        if self.transition.active:
+            self.current_menu = self.transition.to_menu
+        self.transition.start(from_menu, to_menu)
+    
+    def _draw_screen(self, frame, menu):
+        """Draw a menu or the game interface"""
+        if menu == "main":
+            self.draw_menu(frame)
+        elif menu == "difficulty":
+            self.draw_difficulty_menu(frame)
+        elif menu == "game":
+            self.draw_game(frame)
+    
+    def _draw_transition(self, frame):
+        """Draw one frame of the active transition, switching menus when it completes"""
+        transition = self.transition
+        progress = transition.progress()
         
-        # Transition animation loop
-        while True:
-            current_time = time.time()
-            elapsed = current_time - start_time
-            
-            # Calculate progress (0.0 to 1.0)
-            progress = min(1.0, elapsed / duration)
-            
-            # Get camera frame
-            ret, frame = self.camera.read()
-            if not ret:
-                continue
-                
-            # Flip image horizontally
-            frame = cv2.flip(frame, 1)
+        # Draw fade-out effect
+        self._draw_screen(frame, transition.from_menu)
+        
+        if transition.to_menu == "game":
+            # Circular mask shrinking to the center
+            transition.circle_wipe(frame, progress)
             
-            # Draw fade-out effect
-            if from_menu == "main":
-                self.draw_menu(frame)
-            elif from_menu == "difficulty":
-                self.draw_difficulty_menu(frame)
-            elif from_menu == "game":
+            # If transition is complete, draw game interface
+            if progress >= 0.95:
                 self.draw_game(frame)
-                
-            # Create transition mask
-            overlay = frame.copy()
-            alpha = progress  # Alpha from 0 to 1
-            
-            # Different transition effects
-            if to_menu == "game":
-                # Circular mask expanding from center
-                center_x, center_y = frame.shape[1]//2, frame.shape[0]//2
-                max_radius = int(np.sqrt(center_x**2 + center_y**2))
-                radius = int((1.0 - progress) * max_radius)
-                
-                # Draw black background
-                cv2.rectangle(overlay, (0, 0), (frame.shape[1], frame.shape[0]), (0, 0, 0), -1)
-                
-                # Draw circular mask
-                cv2.circle(overlay, (center_x, center_y), radius, (255, 255, 255), -1)
-                
-                # Blend images
-                alpha = 0.9
-                mask = np.zeros_like(frame)
-                cv2.circle(mask, (center_x, center_y), radius, (255, 255, 255), -1)
-                
-                # Create area inside mask
-                masked_frame = cv2.bitwise_and(frame, mask)
-                
-                # Create area outside mask
-                inverse_mask = cv2.bitwise_not(mask)
-                masked_background = cv2.bitwise_and(overlay, inverse_mask)
-                
-                # Combine results
-                frame = cv2.add(masked_frame, masked_background)
-                
-                # If transition is complete, draw game interface
-                if progress >= 0.95:
-                    self.draw_game(frame)
-            else:
-                # Fade in/out effect
-                cv2.addWeighted(overlay, alpha, frame, 1 - alpha, 0, frame)
-                
-                # Draw target menu
-                if progress >= 0.5:  # Start drawing target menu at midpoint
-                    if to_menu == "main":
-                        self.draw_menu(frame)
-                    elif to_menu == "difficulty":
-                        self.draw_difficulty_menu(frame)
-                    elif to_menu == "game":
-                        self.draw_game(frame)
-            
-            # Display frame
-            self.window.show(frame)
-            
-            # Check keys
-            key = self.window.wait_key(int(frame_time * 1000))
-            if key == 27:  # ESC
-                self.running = False
-                break
-            
-            # Check if transition is complete
-            if progress >= 1.0:
-                break
+        elif progress >= 0.5:
+            # Start drawing target menu at midpoint
+            self._draw_screen(frame, transition.to_menu)
         
         # Update current menu state
-        self.current_menu = to_menu
+        if progress >= 1.0:
+            self.current_menu = transition.to_menu
+            transition.stop()
     
     def initialize_camera(self):
         """Initialize camera"""
         try:
-            self.camera = DirectCamera(0, CAMERA_WIDTH, CAMERA_HEIGHT, True)
+            # 先释放旧的摄像头（及其抓帧线程），否则新实例无法打开设备
+            if self.camera is not None:
+                self.camera.release()
+            if self.camera_factory is not None:
+                self.camera = self.camera_factory()
+            else:
+                self.camera = DirectCamera(CAMERA_INDEX, CAMERA_WIDTH, CAMERA_HEIGHT, True,
+                                           threaded=CAMERA_THREADED, frame_pool=self.frame_pool)
             return self.camera.is_opened()
         except Exception as e:
             print(f"Failed to initialize camera: {e}")
@@ -1432,9 +1341,23 @@ class Game:
     
     def run(self):
         """Run game loop"""
+        if not self.setup():
+            return
+        
+        while self.running:
+            self.run_frame()
+        
+        self._cleanup()
+    
+    def setup(self):
+        """Create the window and camera and prepare the game loop
+        
+        Returns:
+            bool: Whether the game loop can run
+        """
         if not self.window.create():
             print("Unable to create window, game exiting")
-            return
+            return False
             
         if not self.initialize_camera():
             print("Unable to initialize camera, game may not function properly")
@@ -1449,40 +1372,69 @@ class Game:
         # Set game reference in window
         self.window.game = self
         
+        # 性能HUD切换按键
+        try:
+            self.profiler_hud_key = pygame.key.key_code(PROFILER["hud_key"])
+        except Exception as e:
+            print(f"Invalid profiler HUD key {PROFILER['hud_key']}: {e}")
+        
         self.running = True
+        return True
+    
+    def run_frame(self):
+        """Run one iteration of the game loop"""
+        frame_start = time.perf_counter()
+        self.detect_time = 0
+        self.profiler.begin_frame()
         
-        while self.running:
+        with self.profiler.stage("camera"):
             ret, frame = self.camera.read()
-            
-            if not ret:
-                print("Unable to get camera frame, attempting to reconnect...")
-                if not self.initialize_camera():
-                    print("Failed to reconnect camera, will use black background")
-                    # 创建一个黑色背景
-                    frame = np.zeros((CAMERA_HEIGHT, CAMERA_WIDTH, 3), dtype=np.uint8)
-            
-            # Horizontally flip image (mirror)
-            if frame is not None:
-                frame = cv2.flip(frame, 1)
-            
-            # 如果在游戏界面，更新游戏状态
-            if self.current_menu == "game":
-                self._update_game_state(frame)
-            
-            # Draw current menu or game state
-            if self.current_menu == "main":
-                self.draw_menu(frame)
-            elif self.current_menu == "difficulty":
-                self.draw_difficulty_menu(frame)
-            elif self.current_menu == "game":
-                self.draw_game(frame)
-            
+        
+        if not ret:
+            print("Unable to get camera frame, attempting to reconnect...")
+            if not self.initialize_camera():
+                print("Failed to reconnect camera, will use black background")
+                # 使用缓存的黑色背景
+                frame = self.frame_pool.placeholder(CAMERA_WIDTH, CAMERA_HEIGHT)
+        
+        # Horizontally flip image (mirror) into the reused buffer, later stages draw on it
+        if frame is not None:
+            frame = self.frame_pool.mirror(frame)
+        
+        # 根据游戏状态调度推理：回合中全速，结束画面降频，菜单中停止
+        if self.current_menu != "game":
+            self.detector.scheduler.set_state("menu")
+        elif self.game_over:
+            self.detector.scheduler.set_state("game_over")
+        else:
+            self.detector.scheduler.set_state("active")
+        
+        # 如果在游戏界面，更新游戏状态
+        if self.current_menu == "game":
+            self._update_game_state(frame)
+        
+        # Draw current menu or game state
+        with self.profiler.stage("draw"):
+            if self.transition.active:
+                self._draw_transition(frame)
+            else:
+                self._draw_screen(frame, self.current_menu)
+        
+        self.profiler.draw_hud(frame)
+        
+        with self.profiler.stage("show"):
             self.window.show(frame)
-            
-            if self.window.wait_key(1) == 27:  # ESC key to exit
-                self.running = False
         
-        self._cleanup()
+        # 记录本帧渲染耗时（不含帧率限制的等待和同步推理），调度器据此避免推理挤占渲染
+        self.detector.scheduler.record_frame(time.perf_counter() - frame_start - self.detect_time)
+        
+        key = self.window.wait_key(1)
+        if key == 27:  # ESC key to exit
+            self.running = False
+        elif key == self.profiler_hud_key:
+            self.profiler.toggle_hud()
+        
+        self.profiler.end_frame()
     
     def _update_game_state(self, frame):
         """Update game state"""
@@ -1508,17 +1460,30 @@ class Game:
                 self.select_random_target()
                 self.auto_next_target_time = 0  # 重置定时器
         
-        # 运行对象检测
-        detections = self.detector.detect_objects(frame)
-        frame = self.detector.draw_detection_boxes(frame, detections)
+        # 运行对象检测（异步模式下只提交帧并返回最新的已完成结果）
+        detect_start = time.perf_counter()
+        with self.profiler.stage("detect"):
+            self.detector.detect_objects(frame)
+        self.detect_time = time.perf_counter() - detect_start
+        frame = self.detector.draw_detection_boxes(frame, self.current_target)
+        
+        # 记录新完成的推理，用于统计推理帧率和延迟
+        if self.detector.result_frame_id != self.last_result_frame_id:
+            self.last_result_frame_id = self.detector.result_frame_id
+            self.profiler.mark("inference")
+            self.profiler.record("inference", self.detector.inference_time * 1000)
         
         # 检查是否找到目标对象
-        self.check_target_found(detections)
+        self.check_target_found()
     
     def _cleanup(self):
         """Clean up resources"""
+        # 停止推理线程/进程并释放共享内存
+        self.detector.close()
         if self.camera is not None:
             self.camera.release()
+        if self.profiler_export_path:
+            self.profiler.export(self.profiler_export_path)
         self.window.destroy()
     
     def start_game(self):
@@ -1562,8 +1527,20 @@ class Game:
         
         self.current_target = random.choice(available_targets)
         print(f"New target object: {self.current_target}")
+        self._sync_detector_classes()
+    
+    def _sync_detector_classes(self):
+        """Restrict detection to the classes the current round can use"""
+        self.detector.set_focus_target(self.current_target)
+        class_filter = DETECTION.get("class_filter")
+        if class_filter == "target":
+            self.detector.set_active_classes([self.current_target])
+        elif class_filter == "difficulty":
+            self.detector.set_active_classes(OBJECTS[self.difficulty])
+        else:
+            self.detector.set_active_classes(None)
     
-    def check_target_found(self, detections):
+    def check_target_found(self):
         """Check if target object is found"""
         if not self.current_target or self.time_remaining <= 0 or self.game_over:
             return
@@ -1572,36 +1549,29 @@ class Game:
         if self.current_target in self.found_targets:
             return
             
+        # 由检测器在最近几次推理结果上投票确认目标
         required_confidence = DIFFICULTY_LEVELS.get(self.difficulty, 0.5)
+        if not self.detector.check_target_found(self.current_target, required_confidence):
+            return
         
-        for detection in detections:
-            detected_class, confidence = detection[:2]
-            if detected_class == self.current_target and confidence >= required_confidence:
-                print(f"Found target object {self.current_target}! Score +1")
-                self.score += 1
-                self.target_found = True
-                self.target_found_time = time.time()
-                
-                # 将当前目标添加到已找到集合中，防止重复加分
-                self.found_targets.add(self.current_target)
-                
-                # Play correct sound - 修复音效播放方式
-                self._play_sound("correct")
-                
-                # 创建庆祝粒子效果
-                center_x, center_y = self.get_center_x(), self.get_center_y()
-                for _ in range(20):
-                    x = random.randint(center_x - 100, center_x + 100)
-                    y = random.randint(center_y - 100, center_y + 100)
-                    self.celebration_particles.append(
-                        self.create_particle(x, y, COLORS["success"])
-                    )
-                
-                # 自动选择新目标，不需要手动点击Next
-                # 设置延迟定时器，在庆祝动画结束后选择新目标
-                self.auto_next_target_time = time.time() + ANIMATION["celebration_duration"]
-                
-                break
+        print(f"Found target object {self.current_target}! Score +1")
+        self.score += 1
+        self.target_found = True
+        self.target_found_time = time.time()
+        
+        # 将当前目标添加到已找到集合中，防止重复加分
+        self.found_targets.add(self.current_target)
+        
+        # Play correct sound - 修复音效播放方式
+        self._play_sound("correct")
+        
+        # 创建庆祝粒子效果
+        center_x, center_y = self.get_center_x(), self.get_center_y()
+        self.particles.emit(center_x, center_y, COLORS["success"], count=20, spread=100)
+        
+        # 自动选择新目标，不需要手动点击Next
+        # 设置延迟定时器，在庆祝动画结束后选择新目标
+        self.auto_next_target_time = time.time() + ANIMATION["celebration_duration"]
     
     def handle_mouse_click(self, event, x, y, flags, param):
         """Handle mouse click events"""
@@ -1651,10 +1621,7 @@ class Game:
                                     # 创建粒子效果
                                     color = COLORS["success"] if difficulty_value == "normal" else (
                                         COLORS["info"] if difficulty_value == "easy" else COLORS["warning"])
-                                    for _ in range(15):
-                                        self.celebration_particles.append(
-                                            self.create_particle(x, y, color)
-                                        )
+                                    self.particles.emit(x, y, color, count=15)
                                     
                                     # 修改：选择难度后返回主菜单，而不是直接开始游戏
                                     self.transition_to("difficulty", "main")
@@ -1725,10 +1692,7 @@ class Game:
                                     # 播放错误音效提示玩家限制已用完
                                     self._play_sound("error")
                                     # 创建红色粒子提示玩家限制已用完
-                                    for _ in range(10):
-                                        self.celebration_particles.append(
-                                            self.create_particle(x, y, COLORS["danger"])
-                                        )
+                                    self.particles.emit(x, y, COLORS["danger"], count=10)
                                     print("Hard mode: No more Next clicks allowed!")
                                     return True
                                 
@@ -1804,7 +1768,7 @@ class Game:
         
         return img
     
-    def create_glass_effect(self, frame, rect, color, alpha=0.7, blur=5, border_radius=10):
+    def create_glass_effect(self, frame, rect, color, alpha=0.7, blur=5, border_radius=10, blur_scale=1):
         """创建玻璃拟态效果
         
         参数:
@@ -1814,6 +1778,7 @@ class Game:
             alpha: 透明度
             blur: 模糊程度
             border_radius: 边框圆角
+            blur_scale: 大于1时先缩小这么多倍再模糊，用于每帧重绘的大面积区域
             
         返回:
             处理后的图像
@@ -1828,44 +1793,57 @@ class Game:
         if x2 <= x1 or y2 <= y1:
             return frame
         
-        # 提取区域并模糊
-        roi = frame[y1:y2, x1:x2].copy()
-        
-        # 确保blur是正奇数
-        if blur <= 0:
-            blur = 5  # 默认值
-        if blur % 2 == 0:
-            blur += 1  # 如果是偶数，加1使其变为奇数
+        with self.profiler.stage("glass"):
+            # 确保blur是正奇数
+            if blur <= 0:
+                blur = 5  # 默认值
+            if blur % 2 == 0:
+                blur += 1  # 如果是偶数，加1使其变为奇数
             
-        blurred = cv2.GaussianBlur(roi, (blur, blur), 0)
-        
-        # 创建遮罩
-        mask = np.zeros((y2-y1, x2-x1, 3), dtype=np.uint8)
-        mask = self.draw_rounded_rect(mask, (0, 0, x2-x1, y2-y1), (255, 255, 255), border_radius)
-        
-        # 将颜色与模糊图像混合
-        overlay = mask.copy()
-        if len(color) == 3:
-            overlay = self.draw_rounded_rect(overlay, (0, 0, x2-x1, y2-y1), color, border_radius)
-            cv2.addWeighted(overlay, alpha, blurred, 1-alpha, 0, blurred)
-        else:
-            # 如果颜色包含alpha通道
-            overlay = self.draw_rounded_rect(overlay, (0, 0, x2-x1, y2-y1), color[:3], border_radius)
-            cv2.addWeighted(overlay, color[3]/255, blurred, 1-color[3]/255, 0, blurred)
-        
-        # 创建带圆角的遮罩
-        mask_gray = cv2.cvtColor(mask, cv2.COLOR_BGR2GRAY)
-        
-        # 将处理后的ROI放回原图
-        roi_result = frame[y1:y2, x1:x2]
-        np.copyto(roi_result, blurred, where=mask>0)
-        
-        # 添加边框效果
-        border_color = (255, 255, 255)
-        self.draw_rounded_rect(frame, (x1, y1, x2, y2), border_color, border_radius, 1)
+            # 提取区域并模糊
+            roi = frame[y1:y2, x1:x2]
+            if blur_scale > 1:
+                blurred = self._downscaled_blur(roi, blur, blur_scale)
+            else:
+                blurred = cv2.GaussianBlur(roi, (blur, blur), 0)
+            
+            # 获取缓存的圆角遮罩和着色层
+            mask, overlay = self.glass_cache.get(x2-x1, y2-y1, border_radius, color)
+            
+            # 将颜色与模糊图像混合
+            if len(color) == 3:
+                cv2.addWeighted(overlay, alpha, blurred, 1-alpha, 0, blurred)
+            else:
+                # 如果颜色包含alpha通道
+                cv2.addWeighted(overlay, color[3]/255, blurred, 1-color[3]/255, 0, blurred)
+            
+            # 将处理后的ROI放回原图
+            cv2.copyTo(blurred, mask, roi)
+            
+            # 添加边框效果
+            border_color = (255, 255, 255)
+            self.draw_rounded_rect(frame, (x1, y1, x2, y2), border_color, border_radius, 1)
         
         return frame
     
+    @staticmethod
+    def _downscaled_blur(roi, blur, scale):
+        """缩小后模糊再放大回原尺寸，效果接近全分辨率的大核高斯模糊
+        
+        参数:
+            roi: 要模糊的区域
+            blur: 全分辨率下的模糊核大小
+            scale: 缩小倍数
+            
+        返回:
+            与roi同尺寸的模糊图像
+        """
+        h, w = roi.shape[:2]
+        small = cv2.resize(roi, (max(1, w // scale), max(1, h // scale)), interpolation=cv2.INTER_AREA)
+        kernel = max(3, (blur // scale) | 1)
+        cv2.GaussianBlur(small, (kernel, kernel), 0, dst=small)
+        return cv2.resize(small, (w, h), interpolation=cv2.INTER_LINEAR)
+    
     def create_gradient(self, frame, rect, color1, color2, vertical=True):
         """创建渐变效果
         
@@ -1889,38 +1867,12 @@ class Game:
         if x2 <= x1 or y2 <= y1:
             return frame
         
-        # 创建渐变蒙版
-        gradient = np.zeros((y2-y1, x2-x1, 3), dtype=np.uint8)
-        
-        if vertical:
-            # 垂直渐变
-            for y in range(y2-y1):
-                alpha = y / (y2-y1-1)
-                g_color = [
-                    int(color1[0] * (1 - alpha) + color2[0] * alpha),
-                    int(color1[1] * (1 - alpha) + color2[1] * alpha),
-                    int(color1[2] * (1 - alpha) + color2[2] * alpha)
-                ]
-                gradient[y, :] = g_color
-        else:
-            # 水平渐变
-            for x in range(x2-x1):
-                alpha = x / (x2-x1-1)
-                g_color = [
-                    int(color1[0] * (1 - alpha) + color2[0] * alpha),
-                    int(color1[1] * (1 - alpha) + color2[1] * alpha),
-                    int(color1[2] * (1 - alpha) + color2[2] * alpha)
-                ]
-                gradient[:, x] = g_color
-        
-        # 提取原区域
-        roi = frame[y1:y2, x1:x2]
+        # 获取缓存的渐变（同一尺寸和颜色只生成一次）
+        gradient = self.gradient_cache.get(x2-x1, y2-y1, color1, color2, vertical)
         
-        # 将渐变和原图合并
-        result = cv2.addWeighted(gradient, 0.7, roi, 0.3, 0)
-        
-        # 放回原图
-        frame[y1:y2, x1:x2] = result
+        # 将渐变和原图直接在原区域内合并
+        roi = frame[y1:y2, x1:x2]
+        cv2.addWeighted(gradient, 0.7, roi, 0.3, 0, dst=roi)
         
         return frame
                     
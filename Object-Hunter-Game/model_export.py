@@ -0,0 +1,140 @@
+"""
+Model Export - Exports YOLO weights to ONNX / OpenVINO once and caches the result on disk
+"""
+import hashlib
+import json
+import os
+import shutil
+
+# Backends that can be exported, mapped to the ultralytics export format
+EXPORT_FORMATS = {
+    "onnx": "onnx",
+    "openvino": "openvino"
+}
+
+# Hashes of large weight files are remembered by size and modification time
+HASH_INDEX = "hashes.json"
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """SHA-256 of a file"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cached_file_hash(path, cache_dir):
+    """SHA-256 of a file, reusing the stored value while size and mtime are unchanged"""
+    index_path = os.path.join(cache_dir, HASH_INDEX)
+    try:
+        with open(index_path, "r") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = {}
+    
+    stat = os.stat(path)
+    key = os.path.abspath(path)
+    entry = index.get(key)
+    if entry and entry.get("size") == stat.st_size and entry.get("mtime") == stat.st_mtime:
+        return entry["sha256"]
+    
+    digest = file_hash(path)
+    index[key] = {"size": stat.st_size, "mtime": stat.st_mtime, "sha256": digest}
+    try:
+        with open(index_path, "w") as f:
+            json.dump(index, f, indent=2)
+    except OSError as e:
+        print(f"Warning: Could not update model hash index: {e}")
+    return digest
+
+
+def export_settings(backend, imgsz):
+    """Export arguments for a backend and inference size
+    
+    Args:
+        backend: "onnx" or "openvino"
+        imgsz: Fixed inference size, or None to export with dynamic input shapes
+    """
+    settings = {"format": EXPORT_FORMATS[backend]}
+    if imgsz:
+        settings["imgsz"] = int(imgsz)
+    else:
+        settings["dynamic"] = True
+    return settings
+
+
+def cache_key(weights_hash, settings):
+    """Cache entry name for a weights hash and export settings"""
+    settings_text = json.dumps(settings, sort_keys=True)
+    settings_hash = hashlib.sha256(settings_text.encode("utf-8")).hexdigest()
+    return f"{weights_hash[:16]}_{settings_hash[:8]}"
+
+
+def get_exported_model(weights_path, backend, imgsz, cache_dir):
+    """Get the path of an exported model, exporting it on first use
+    
+    Args:
+        weights_path: PyTorch .pt weights
+        backend: "onnx" or "openvino"
+        imgsz: Fixed inference size, or None for dynamic input shapes
+        cache_dir: Directory holding exported models
+    
+    Returns:
+        str: Path to load with YOLO(), or None if the export is unavailable
+    """
+    if backend not in EXPORT_FORMATS:
+        print(f"Unknown model backend: {backend}")
+        return None
+    if not os.path.exists(weights_path):
+        print(f"Cannot export model, weights not found: {weights_path}")
+        return None
+    
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        settings = export_settings(backend, imgsz)
+        stem = os.path.splitext(os.path.basename(weights_path))[0]
+        entry_dir = os.path.join(cache_dir, f"{stem}_{cache_key(cached_file_hash(weights_path, cache_dir), settings)}")
+        
+        # Cache hit
+        metadata_path = os.path.join(entry_dir, "export.json")
+        if os.path.exists(metadata_path):
+            with open(metadata_path, "r") as f:
+                artifact = os.path.join(entry_dir, json.load(f)["artifact"])
+            if os.path.exists(artifact):
+                return artifact
+        
+        print(f"Exporting {weights_path} to {backend} ({settings}), this only happens once...")
+        artifact = _export(weights_path, settings, entry_dir)
+        
+        with open(metadata_path, "w") as f:
+            json.dump({
+                "weights": os.path.abspath(weights_path),
+                "settings": settings,
+                "artifact": os.path.basename(artifact)
+            }, f, indent=2)
+        print(f"Exported model cached at {artifact}")
+        return artifact
+    
+    except Exception as e:
+        print(f"Model export to {backend} failed: {e}")
+        return None
+
+
+def _export(weights_path, settings, entry_dir):
+    """Run the ultralytics export and move the result into the cache entry"""
+    from ultralytics import YOLO
+    
+    exported = str(YOLO(weights_path).export(**settings))
+    
+    # ultralytics writes next to the weights (a file for ONNX, a directory for OpenVINO)
+    os.makedirs(entry_dir, exist_ok=True)
+    target = os.path.join(entry_dir, os.path.basename(os.path.normpath(exported)))
+    if os.path.exists(target):
+        if os.path.isdir(target):
+            shutil.rmtree(target)
+        else:
+            os.remove(target)
+    shutil.move(exported, target)
+    return target
@@ -0,0 +1,100 @@
+"""
+Motion Gate - Cheap scene-change check that lets the detector skip unchanged frames
+"""
+import time
+
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """Compares a small grayscale thumbnail against the last inferred frame"""
+    
+    def __init__(self, threshold=0.02, pixel_threshold=15, max_age=2.0, size=(64, 36)):
+        """Initialize motion gate
+        
+        Args:
+            threshold: Fraction of thumbnail pixels that must change to run inference
+            pixel_threshold: Gray level difference for a pixel to count as changed
+            max_age: Inference is forced after this many seconds without a run
+            size: Thumbnail (width, height) used for the comparison
+        """
+        self.threshold = threshold
+        self.pixel_threshold = pixel_threshold
+        self.max_age = max_age
+        self.size = size
+        
+        self._small = None        # Downscaled color frame
+        self._current = None      # Thumbnail of the frame being checked
+        self._reference = None    # Thumbnail of the last frame inference ran on
+        self._diff = None
+        self.reset()
+    
+    def reset(self):
+        """Forget the reference frame and statistics"""
+        self._has_reference = False
+        self.last_run_time = 0
+        self.last_change = 1.0
+        self.checked = 0
+        self.skipped = 0
+    
+    def _thumbnail(self, frame):
+        """Downscale and convert a frame to grayscale into the reused buffer"""
+        # Subsample to about twice the thumbnail size first, area-averaging the full frame is slow
+        w, h = self.size
+        step = max(1, min(frame.shape[0] // (h * 2), frame.shape[1] // (w * 2)))
+        self._small = cv2.resize(frame[::step, ::step], self.size, dst=self._small, interpolation=cv2.INTER_AREA)
+        if self._small.ndim == 2:
+            np.copyto(self._current, self._small)
+        else:
+            cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=self._current)
+        return self._current
+    
+    def should_run(self, frame, now=None):
+        """Decide whether a frame needs a fresh inference run
+        
+        Args:
+            frame: Frame about to be passed to the model
+            now: Current time, defaults to time.time()
+        
+        Returns:
+            bool: True to run inference, False to keep the previous results
+        """
+        now = time.time() if now is None else now
+        if self._current is None:
+            w, h = self.size
+            self._current = np.empty((h, w), dtype=np.uint8)
+            self._reference = np.empty((h, w), dtype=np.uint8)
+            self._diff = np.empty((h, w), dtype=np.uint8)
+        
+        current = self._thumbnail(frame)
+        self.checked += 1
+        
+        if self._has_reference and now - self.last_run_time < self.max_age:
+            cv2.absdiff(current, self._reference, dst=self._diff)
+            changed = np.count_nonzero(self._diff > self.pixel_threshold)
+            self.last_change = float(changed / self._diff.size)
+            if self.last_change < self.threshold:
+                self.skipped += 1
+                return False
+        else:
+            self.last_change = 1.0
+        
+        # The frame will be inferred, it becomes the new reference
+        self._current, self._reference = self._reference, self._current
+        self._has_reference = True
+        self.last_run_time = now
+        return True
+    
+    def get_stats(self):
+        """Get gate statistics
+        
+        Returns:
+            dict: checked / skipped frame counts, skip ratio and the last change fraction
+        """
+        return {
+            "checked": self.checked,
+            "skipped": self.skipped,
+            "skip_ratio": self.skipped / self.checked if self.checked else 0.0,
+            "last_change": self.last_change
+        }
@@ -5,30 +5,210 @@ import cv2
 import numpy as np
 import time
 import os
-from ultralytics import YOLO
-from config import DETECTION, PATHS, COLORS
+import threading
+from config import DETECTION, SCHEDULER, PATHS, COLORS, CAMERA_WIDTH, CAMERA_HEIGHT
+import model_export
+from tracker import ObjectTracker
+from motion_gate import MotionGate
+from scheduler import DetectionScheduler
+from confidence_history import ConfidenceHistory
+import tiling
+
+# One row per detection: model class ID, confidence and (x1, y1, x2, y2) box
+DETECTION_DTYPE = np.dtype([
+    ("class_id", np.int32),
+    ("confidence", np.float32),
+    ("box", np.int32, (4,))
+])
 
 class ObjectDetector:
-    def __init__(self):
-        """Initialize object detector"""
-        # Load YOLO model
+    def __init__(self, load_in_background=False, load_model=True):
+        """Initialize object detector
+        
+        Args:
+            load_in_background: Load and warm up the model on a background thread
+                                instead of blocking here (see start_loading / is_ready)
+            load_model: False leaves the detector in the loading state without a
+                        model, until share_model is called
+        """
+        # YOLO model, loaded at the end of __init__ or by start_loading
         self.model = None
         self.model_path = PATHS["model"]
+        self.backend = DETECTION.get("backend", "pytorch")  # Format actually loaded, see _load_model
         
-        # Try to load the model
-        self._load_model()
+        # Class filter passed to the model (None = all classes)
+        self.class_names = {}         # Model class ID -> class name, built when the model loads
+        self.class_ids = {}           # Class name -> model class ID
+        self.active_classes = None
+        self._class_filter_cache = {}  # Tuple of class names -> list of class IDs
+        self._requested_classes = None  # Last set_active_classes argument, reapplied after loading
         
         # Detection settings
         self.confidence_threshold = DETECTION["confidence_threshold"]
         self.cooldown = DETECTION["cooldown"]
         self.last_detection_time = 0
         
-        # Detection results
-        self.detection_results = []
-        self.detection_history = []
+        # Decides when inference runs (replaces the fixed cooldown unless disabled)
+        self.scheduler = DetectionScheduler(
+            target_fps=SCHEDULER["target_fps"],
+            active_duty=SCHEDULER["active_duty"],
+            game_over_interval=SCHEDULER["game_over_interval"],
+            min_interval=SCHEDULER["min_interval"],
+            fixed_interval=None if SCHEDULER["enabled"] else self.cooldown
+        )
+        self.max_results = 10         # Keep top N detections per frame
+        
+        # Inference resolution (longest side fed to the model, see DETECTION["inference_size"])
+        self.inference_size = DETECTION.get("inference_size")
+        self.inference_sizes = sorted(DETECTION.get("inference_sizes", (320, 416, 512, 640)))
+        self.target_latency = DETECTION.get("target_latency", 0.15)
+        self.size_latency = {}        # Inference size -> latency EMA (seconds), used by auto mode
+        if self.inference_size == "auto":
+            self.current_inference_size = self.inference_sizes[-1]
+        else:
+            self.current_inference_size = self.inference_size
+        self._resize_buffer = None
+        
+        # Tiled inference (see DETECTION["tiling"])
+        self.tiling = DETECTION.get("tiling")
+        if self.tiling is not None and self.tiling not in tiling.MODES:
+            print(f"Warning: Unknown tiling mode {self.tiling}, using the full frame")
+            self.tiling = None
+        self.focus_target = None      # Class whose last seen region "focus" mode crops
+        self.focus_box = None         # Where focus_target was last detected
+        
+        # Detection results (structured array of DETECTION_DTYPE, sorted by confidence)
+        self.detection_results = np.empty(0, dtype=DETECTION_DTYPE)
+        self.confidence_history = None  # ConfidenceHistory over the model classes, created when the model loads
+        self.result_frame_id = 0      # ID of the frame the current results came from
+        self.result_timestamp = 0     # Capture time of that frame
+        self.inference_time = 0       # Duration of the last inference run (seconds)
+        
+        # Tracks carry detections between inference runs (see get_tracks)
+        self.tracker = None
+        if DETECTION.get("tracking", False):
+            self.tracker = ObjectTracker(iou_threshold=DETECTION.get("track_iou_threshold", 0.3),
+                                         max_missed=DETECTION.get("track_max_missed", 2),
+                                         max_prediction=DETECTION.get("track_max_prediction", 1.0))
+        
+        # Skips inference on frames that barely differ from the last inferred one
+        self.motion_gate = None
+        if DETECTION.get("motion_gate", False):
+            self.motion_gate = MotionGate(threshold=DETECTION.get("motion_threshold", 0.02),
+                                          pixel_threshold=DETECTION.get("motion_pixel_threshold", 15),
+                                          max_age=DETECTION.get("motion_max_age", 2.0))
+        
+        # Async inference state (see start_async)
+        self.async_mode = False
+        self.frame_id = 0             # ID of the last submitted frame
+        self.dropped_frames = 0       # Frames replaced before the worker got to them
+        self._lock = threading.Lock()
+        self._frame_ready = threading.Condition(self._lock)
+        self._pending_frame = None    # Newest submitted frame, waiting for the worker
+        self._working_frame = None    # Frame the worker is currently running on
+        self._pending_id = 0
+        self._pending_timestamp = 0
+        self._has_pending = False
+        self._worker = None
+        self._worker_running = False
+        
+        # Model readiness: loading -> warming -> ready, or failed
+        self.state = "loading"
+        self.load_error = None
+        self.load_time = 0            # Seconds spent loading and warming up
+        self._loader = None
+        
+        if not load_model:
+            return
+        if load_in_background:
+            self.start_loading()
+        else:
+            start_time = time.perf_counter()
+            self._load_model()
+            self.state = "warming"
+            self.warm_up()
+            self.load_time = time.perf_counter() - start_time
+            self.state = "ready"
+    
+    def start_loading(self):
+        """Load and warm up the model on a background thread"""
+        if self._loader is not None:
+            return
+        
+        self.state = "loading"
+        self._loader = threading.Thread(target=self._load_in_background,
+                                        name="ObjectDetectorLoader",
+                                        daemon=True)
+        self._loader.start()
+    
+    def _load_in_background(self):
+        """Background loader thread"""
+        start_time = time.perf_counter()
+        try:
+            self._load_model()
+            self.state = "warming"
+            self.warm_up()
+            self.load_time = time.perf_counter() - start_time
+            self.state = "ready"
+            print(f"Object detector ready after {self.load_time:.1f}s")
+        except Exception as e:
+            self.load_error = str(e)
+            self.state = "failed"
+            print(f"Object detector failed to load: {e}")
+    
+    def share_model(self, owner):
+        """Use the model loaded by another detector instead of loading a copy
+        
+        Detection state (history, tracks, motion gate, scheduler) stays per
+        detector; only the model and its settings are shared.
+        
+        Args:
+            owner: Ready ObjectDetector holding the model
+        """
+        self.model = owner.model
+        self.model_path = owner.model_path
+        self.backend = owner.backend
+        self.current_inference_size = owner.current_inference_size
+        self._build_class_map()
+        self.load_time = owner.load_time
+        self.state = "ready"
+    
+    def is_ready(self):
+        """Check whether the model is loaded and warmed up"""
+        return self.state == "ready"
+    
+    def warm_up(self, frames=None):
+        """Run dummy frames through the model so the first real detection
+        does not pay for graph / kernel initialization
+        
+        Args:
+            frames: Frames per inference size, defaults to DETECTION["warmup_frames"]
+        """
+        frames = DETECTION.get("warmup_frames", 2) if frames is None else frames
+        if frames <= 0 or self.model is None:
+            return
+        
+        start_time = time.perf_counter()
+        dummy = np.zeros((CAMERA_HEIGHT, CAMERA_WIDTH, 3), dtype=np.uint8)
+        
+        # Auto mode may switch sizes later, so warm up every candidate
+        sizes = self.inference_sizes if self.inference_size == "auto" else [self.current_inference_size]
+        for size in sizes:
+            self.current_inference_size = size
+            for _ in range(frames):
+                self._run_inference(dummy)
+        
+        # Warm-up timings include one-off initialization, start auto mode from scratch
+        self.size_latency = {}
+        if self.inference_size == "auto":
+            self.current_inference_size = self.inference_sizes[-1]
+        print(f"Model warm-up finished in {time.perf_counter() - start_time:.2f}s")
     
     def _load_model(self):
         """Load YOLO model with better error handling"""
+        # Imported here so the game window can open before ultralytics / torch are loaded
+        from ultralytics import YOLO
+        
         # Check if model file exists
         if not os.path.exists(self.model_path):
             print(f"Warning: Model file not found at {self.model_path}")
@@ -41,6 +221,14 @@ class ObjectDetector:
                     print(f"Found alternative model: {model_name}")
                     break
         
+        # Prefer an exported ONNX / OpenVINO model, fall back to the .pt weights
+        if self.backend != "pytorch":
+            if self._load_exported_model():
+                self._build_class_map()
+                return
+            print("Falling back to PyTorch weights")
+            self.backend = "pytorch"
+        
         try:
             print(f"Loading YOLO model: {self.model_path}")
             self.model = YOLO(self.model_path)
@@ -69,9 +257,102 @@ class ObjectDetector:
                 except Exception as e:
                     print(f"Critical error: Failed to load any YOLO model: {e}")
                     raise RuntimeError("Failed to load YOLO model")
+        
+        self._build_class_map()
+    
+    def _load_exported_model(self):
+        """Load the exported model for the configured backend, exporting it on first use
+        
+        Returns:
+            bool: Success status
+        """
+        # A fixed inference size gets a static export, auto / full frame needs dynamic shapes
+        imgsz = DETECTION.get("inference_size")
+        if not isinstance(imgsz, int):
+            imgsz = None
+        
+        artifact = model_export.get_exported_model(self.model_path, self.backend, imgsz, PATHS["model_cache"])
+        if artifact is None:
+            return False
+        
+        from ultralytics import YOLO
+        
+        try:
+            print(f"Loading {self.backend} model: {artifact}")
+            self.model = YOLO(artifact, task='detect')
+            print(f"Successfully loaded {self.backend} model")
+            return True
+        except Exception as e:
+            print(f"Error loading {self.backend} model: {e}")
+            self.model = None
+            return False
+    
+    def _build_class_map(self, names=None):
+        """Build the class name -> ID map for the loaded model
+        
+        Args:
+            names: Class ID -> name dict, defaults to the names of self.model
+        """
+        self.class_names = self.model.names if names is None else names
+        self.class_ids = {name: class_id for class_id, name in self.class_names.items()}
+        self._class_filter_cache = {}
+        self.confidence_history = ConfidenceHistory(max(self.class_names) + 1,
+                                                    size=DETECTION["history_size"],
+                                                    mode=DETECTION.get("vote_mode", "k_of_n"),
+                                                    k=DETECTION["required_consecutive"],
+                                                    ema_alpha=DETECTION.get("vote_ema_alpha", 0.5))
+        
+        # Apply a filter requested before the model finished loading
+        if self._requested_classes is not None:
+            self.set_active_classes(self._requested_classes)
+    
+    def set_active_classes(self, class_names):
+        """Restrict inference to the given classes
+        
+        The ID list for each set of names is cached, so calling this every
+        time the target changes is cheap.
+        
+        Args:
+            class_names: Iterable of class names, or None to detect all classes
+        
+        Returns:
+            list: Active class IDs, or None if no filter is applied
+        """
+        self._requested_classes = class_names
+        if class_names is None or not self.class_ids:
+            self.active_classes = None
+            return None
+        
+        key = tuple(class_names)
+        class_ids = self._class_filter_cache.get(key)
+        if class_ids is None:
+            unknown = [name for name in key if name not in self.class_ids]
+            if unknown:
+                print(f"Warning: Classes not known to the model: {', '.join(unknown)}")
+            class_ids = sorted({self.class_ids[name] for name in key if name in self.class_ids})
+            self._class_filter_cache[key] = class_ids
+        
+        # An empty filter would detect nothing, fall back to all classes
+        self.active_classes = class_ids or None
+        return self.active_classes
     
     def detect_objects(self, frame):
-        """Detect objects in image"""
+        """Detect objects in image
+        
+        In async mode the frame is handed to the worker thread and the
+        latest published results are returned immediately.
+        """
+        if self.async_mode:
+            # Only hand over frames once a run is due, the worker would drop the others
+            wait_time = self.scheduler.time_until_next()
+            if wait_time is not None and wait_time <= 0:
+                self.submit_frame(frame)
+            return self.detection_results
+        
+        # The model is still loading / warming up on the background thread
+        if not self.is_ready():
+            return self.detection_results
+        
         # Check if model was loaded
         if self.model is None:
             print("Model not loaded, trying to reload...")
@@ -79,75 +360,425 @@ class ObjectDetector:
             if self.model is None:
                 return self.detection_results
         
-        # Check cooldown
+        # Check whether the scheduler wants a run now
         current_time = time.time()
-        if current_time - self.last_detection_time < self.cooldown:
+        wait_time = self.scheduler.time_until_next(current_time)
+        if wait_time is None or wait_time > 0:
+            return self.detection_results
+        
+        self.frame_id += 1
+        
+        # Scene unchanged, keep the previous results; the run stays due, so
+        # the next frame is checked again
+        if self.motion_gate is not None and not self.motion_gate.should_run(frame, current_time):
+            self._reuse_results(current_time)
             return self.detection_results
         
         # Update last detection time
+        self.scheduler.mark_run(current_time)
         self.last_detection_time = current_time
         
-        # Use YOLO model for detection
+        detected_objects = self._run_inference(frame)
+        if detected_objects is not None:
+            self.scheduler.record_latency(self.inference_time)
+            self._publish_results(detected_objects, self.frame_id, current_time)
+        
+        return self.detection_results
+    
+    def _run_inference(self, frame):
+        """Run the model on a frame
+        
+        Returns:
+            np.ndarray: Top detections as a DETECTION_DTYPE array sorted by
+                        confidence, or None if inference failed
+        """
         try:
-            results = self.model(frame)
-            
-            # Get detection results
-            detected_objects = []
-            
-            for r in results:
-                boxes = r.boxes
-                for box in boxes:
-                    # Get class ID and confidence
-                    class_id = int(box.cls[0])
-                    confidence = float(box.conf[0])
-                    
-                    # Get class name
-                    class_name = self.model.names[class_id]
-                    
-                    # Add to detection list if confidence is above threshold
-                    if confidence > self.confidence_threshold:
-                        # Get bounding box coordinates
-                        x1, y1, x2, y2 = map(int, box.xyxy[0])
-                        detected_objects.append((class_name, confidence, (x1, y1, x2, y2)))
-            
-            # Sort by confidence
-            detected_objects.sort(key=lambda x: x[1], reverse=True)
-            
-            # Update detection results
-            self.detection_results = detected_objects[:10]  # Keep top 10 results
+            start_time = time.perf_counter()
+            size = self.current_inference_size
+            if self.tiling:
+                model_input, transforms = self._prepare_tiles(frame, size)
+            else:
+                model_input, scale = self._prepare_input(frame, size)
+                transforms = [scale + (0, 0)]
             
-            # Update detection history
-            if detected_objects:
-                # Add only the highest confidence result to history
-                self.detection_history.append(detected_objects[0][0])
-                # Keep only recent history
-                if len(self.detection_history) > DETECTION["history_size"]:
-                    self.detection_history.pop(0)
+            kwargs = {"classes": self.active_classes}
+            if size:
+                kwargs["imgsz"] = size
+            results = self.model(model_input, **kwargs)
             
-            return self.detection_results
+            detected_objects = self._extract_detections(results, transforms)
+            self.inference_time = time.perf_counter() - start_time
+            self._update_inference_size(size, self.inference_time)
+            return detected_objects
         
         except Exception as e:
             print(f"Error during object detection: {e}")
-            return self.detection_results
+            return None
     
-    def check_target_found(self, target_object):
-        """Check if target object is found"""
-        # Check current detection results
-        for obj, conf, _ in self.detection_results:
-            if obj == target_object and conf > self.confidence_threshold:
-                return True
+    def _prepare_input(self, frame, size):
+        """Downscale a frame so its longest side is at most size
+        
+        The model letterboxes the result to its stride, so the aspect ratio
+        is kept and no extra scaling happens inside the model.
         
-        # Check history for consecutive detections
-        if len(self.detection_history) >= DETECTION["required_consecutive"]:
-            last_n = self.detection_history[-DETECTION["required_consecutive"]:]
-            if all(obj == target_object for obj in last_n):
-                return True
+        Returns:
+            tuple: (model input, (x scale, y scale) back to frame coordinates)
+        """
+        h, w = frame.shape[:2]
+        if not size or max(h, w) <= size:
+            return frame, (1.0, 1.0)
         
-        return False
+        ratio = size / max(h, w)
+        new_w, new_h = max(1, round(w * ratio)), max(1, round(h * ratio))
+        if self._resize_buffer is None or self._resize_buffer.shape[:2] != (new_h, new_w):
+            self._resize_buffer = np.empty((new_h, new_w) + frame.shape[2:], dtype=frame.dtype)
+        cv2.resize(frame, (new_w, new_h), dst=self._resize_buffer, interpolation=cv2.INTER_AREA)
+        return self._resize_buffer, (w / new_w, h / new_h)
+    
+    def _prepare_tiles(self, frame, size):
+        """Crop a frame into tiles and downscale each one for a batched run
+        
+        Tiles are smaller than the frame, so at the same inference size small
+        objects cover more model pixels.
+        
+        Returns:
+            tuple: (list of model inputs, list of (x scale, y scale, x offset, y offset)
+                    back to frame coordinates)
+        """
+        h, w = frame.shape[:2]
+        regions = [(0, 0, w, h)] if DETECTION.get("tile_include_full", True) else []
+        regions += tiling.make_tiles(w, h, self.tiling,
+                                     grid=DETECTION.get("tile_grid", (2, 2)),
+                                     overlap=DETECTION.get("tile_overlap", 0.2),
+                                     center_scale=DETECTION.get("tile_center_scale", 0.6),
+                                     focus_box=self.focus_box)
+        
+        inputs, transforms = [], []
+        for x1, y1, x2, y2 in regions:
+            tile = frame[y1:y2, x1:x2]
+            tile_h, tile_w = tile.shape[:2]
+            if size and max(tile_h, tile_w) > size:
+                ratio = size / max(tile_h, tile_w)
+                new_size = (max(1, round(tile_w * ratio)), max(1, round(tile_h * ratio)))
+                tile = cv2.resize(tile, new_size, interpolation=cv2.INTER_AREA)
+            else:
+                tile = np.ascontiguousarray(tile)
+            inputs.append(tile)
+            transforms.append((tile_w / tile.shape[1], tile_h / tile.shape[0], x1, y1))
+        return inputs, transforms
+    
+    def set_focus_target(self, class_name):
+        """Set the class whose last seen region "focus" tiling crops around"""
+        with self._lock:
+            if class_name != self.focus_target:
+                self.focus_target = class_name
+                self.focus_box = None
+    
+    def _update_inference_size(self, size, latency):
+        """Track latency per size and, in auto mode, step to the largest size meeting the target"""
+        if size is None:
+            return
+        
+        previous = self.size_latency.get(size)
+        self.size_latency[size] = latency if previous is None else previous * 0.8 + latency * 0.2
+        
+        if self.inference_size != "auto" or size not in self.inference_sizes:
+            return
+        
+        index = self.inference_sizes.index(size)
+        if self.size_latency[size] > self.target_latency and index > 0:
+            # Too slow, step down
+            self.current_inference_size = self.inference_sizes[index - 1]
+            print(f"Inference size lowered to {self.current_inference_size}")
+        elif index + 1 < len(self.inference_sizes):
+            # Step up only if the larger size has not already proven too slow
+            larger = self.inference_sizes[index + 1]
+            larger_latency = self.size_latency.get(larger)
+            if self.size_latency[size] < self.target_latency * 0.5 and (
+                    larger_latency is None or larger_latency <= self.target_latency):
+                self.current_inference_size = larger
+                print(f"Inference size raised to {self.current_inference_size}")
+    
+    def _extract_detections(self, results, transforms=None):
+        """Convert model results into a DETECTION_DTYPE array
+        
+        Class IDs, confidences and boxes are copied off the device in one
+        transfer each, then thresholded and reduced to the top results.
+        
+        Args:
+            results: Model results, one per input image
+            transforms: (x scale, y scale, x offset, y offset) per result mapping
+                        boxes back into frame coordinates; with more than one
+                        result, overlapping detections are merged with NMS
+        """
+        class_ids, confidences, boxes = [], [], []
+        for i, r in enumerate(results):
+            if r.boxes is None or len(r.boxes) == 0:
+                continue
+            class_ids.append(r.boxes.cls.cpu().numpy())
+            confidences.append(r.boxes.conf.cpu().numpy())
+            result_boxes = r.boxes.xyxy.cpu().numpy().reshape(-1, 4)
+            if transforms is not None:
+                sx, sy, ox, oy = transforms[i]
+                result_boxes = result_boxes * (sx, sy, sx, sy) + (ox, oy, ox, oy)
+            boxes.append(result_boxes)
+        
+        if not class_ids:
+            return np.empty(0, dtype=DETECTION_DTYPE)
+        
+        class_ids = np.concatenate(class_ids)
+        confidences = np.concatenate(confidences)
+        boxes = np.concatenate(boxes).reshape(-1, 4)
+        
+        # Drop detections below the confidence threshold
+        keep = np.flatnonzero(confidences > self.confidence_threshold)
+        
+        # The same object seen in several tiles (or a tile and the full frame)
+        if transforms is not None and len(transforms) > 1 and len(keep) > 1:
+            keep = keep[tiling.nms(boxes[keep], confidences[keep], class_ids[keep],
+                                   DETECTION.get("tile_nms_iou", 0.5))]
+        
+        # Select the top N without sorting everything, then order them
+        if len(keep) > self.max_results:
+            top = np.argpartition(-confidences[keep], self.max_results - 1)[:self.max_results]
+            keep = keep[top]
+        keep = keep[np.argsort(-confidences[keep], kind="stable")]
+        
+        detected_objects = np.empty(len(keep), dtype=DETECTION_DTYPE)
+        detected_objects["class_id"] = class_ids[keep]
+        detected_objects["confidence"] = confidences[keep]
+        detected_objects["box"] = boxes[keep]
+        return detected_objects
+    
+    def _publish_results(self, detected_objects, frame_id, timestamp):
+        """Store the results of one inference run"""
+        with self._lock:
+            # Update detection results
+            self.detection_results = detected_objects
+            self.result_frame_id = frame_id
+            self.result_timestamp = timestamp
+            if self.tracker is not None:
+                self.tracker.update(detected_objects, timestamp)
+            
+            # Remember where the focus target was last seen
+            if self.focus_target is not None and len(detected_objects):
+                matches = detected_objects[detected_objects["class_id"] == self.class_ids.get(self.focus_target, -1)]
+                if len(matches):
+                    self.focus_box = matches["box"][0].copy()
+            
+            # Update per-class confidence history
+            if self.confidence_history is not None:
+                self.confidence_history.push(detected_objects)
+    
+    def _reuse_results(self, timestamp):
+        """Carry the current results over to a frame the motion gate skipped
+        
+        The frame brings no new measurement, so the tracks keep their last
+        measured state and gain no hits, and the confidence history gets no
+        vote; only inference runs count towards confirmation.
+        """
+        with self._lock:
+            if self.tracker is not None:
+                self.tracker.hold(timestamp)
+    
+    def get_motion_stats(self):
+        """Get motion gate statistics, or None if the gate is disabled"""
+        if self.motion_gate is None:
+            return None
+        return self.motion_gate.get_stats()
+    
+    def start_async(self):
+        """Start the background inference worker
+        
+        Returns:
+            bool: Whether the worker is running
+        """
+        if self._worker is not None and self._worker.is_alive():
+            return True
+        
+        self._worker_running = True
+        self._worker = threading.Thread(target=self._worker_loop,
+                                        name="ObjectDetectorWorker",
+                                        daemon=True)
+        self._worker.start()
+        self.async_mode = True
+        print("Async detection worker started")
+        return True
+    
+    def stop_async(self, timeout=2.0):
+        """Stop the background inference worker"""
+        self.async_mode = False
+        if self._worker is None:
+            return
+        
+        with self._frame_ready:
+            self._worker_running = False
+            self._frame_ready.notify_all()
+        
+        self._worker.join(timeout)
+        self._worker = None
+        print("Async detection worker stopped")
+    
+    def close(self):
+        """Stop inference and release the detector's resources"""
+        self.stop_async()
+    
+    def submit_frame(self, frame, timestamp=None):
+        """Queue a frame for the async worker
+        
+        Only the newest frame is kept; a frame that has not been picked up
+        yet is overwritten and counted as dropped.
+        
+        Returns:
+            int: ID assigned to the submitted frame
+        """
+        with self._frame_ready:
+            if self._pending_frame is None or self._pending_frame.shape != frame.shape:
+                self._pending_frame = np.empty_like(frame)
+            np.copyto(self._pending_frame, frame)
+            
+            if self._has_pending:
+                self.dropped_frames += 1
+            
+            self.frame_id += 1
+            self._pending_id = self.frame_id
+            self._pending_timestamp = time.time() if timestamp is None else timestamp
+            self._has_pending = True
+            self._frame_ready.notify()
+            return self.frame_id
+    
+    def get_latest_results(self):
+        """Get the most recent results
+        
+        Returns:
+            tuple: (results, frame_id, timestamp)
+        """
+        with self._lock:
+            return self.detection_results, self.result_frame_id, self.result_timestamp
+    
+    def get_tracks(self, timestamp=None):
+        """Get the current tracks with boxes predicted to a point in time
+        
+        Args:
+            timestamp: Time to predict to, defaults to now
+        
+        Returns:
+            np.ndarray: TRACK_DTYPE array sorted by confidence, or None if tracking is disabled
+        """
+        if self.tracker is None:
+            return None
+        with self._lock:
+            return self.tracker.predict(time.time() if timestamp is None else timestamp)
+    
+    def get_class_name(self, class_id):
+        """Get the class name for a model class ID"""
+        return self.class_names[int(class_id)]
+    
+    def get_class_id(self, class_name):
+        """Get the model class ID for a class name, or None if unknown"""
+        return self.class_ids.get(class_name)
+    
+    def as_tuples(self, detections=None):
+        """Convert detections to the (class_name, confidence, (x1, y1, x2, y2)) tuple format
+        
+        Args:
+            detections: DETECTION_DTYPE (or TRACK_DTYPE) array, defaults to the latest results
+        
+        Returns:
+            list: Detection tuples sorted by confidence
+        """
+        if detections is None:
+            detections = self.detection_results
+        if not len(detections):
+            return []
+        
+        names = self.class_names
+        return [(names[class_id], confidence, tuple(box))
+                for class_id, confidence, box in zip(detections["class_id"].tolist(),
+                                                     detections["confidence"].tolist(),
+                                                     detections["box"].tolist())]
+    
+    def _worker_loop(self):
+        """Background inference loop, always runs on the newest frame"""
+        while True:
+            with self._frame_ready:
+                while self._worker_running and not self._has_pending:
+                    self._frame_ready.wait()
+                if not self._worker_running:
+                    return
+            
+            # Wait until the scheduler says a run is due; newer frames keep replacing the pending one
+            wait_time = self.scheduler.time_until_next()
+            if wait_time is None:
+                # Inference is paused (menus), drop the frame
+                with self._frame_ready:
+                    self._has_pending = False
+                continue
+            if wait_time > 0:
+                # Sleep in short steps so a state change is picked up quickly
+                time.sleep(min(wait_time, 0.1))
+                continue
+            
+            with self._frame_ready:
+                if not self._worker_running:
+                    return
+                # Swap buffers so submit_frame can keep writing while we run
+                self._pending_frame, self._working_frame = self._working_frame, self._pending_frame
+                frame_id = self._pending_id
+                timestamp = self._pending_timestamp
+                self._has_pending = False
+            
+            # Frames arriving before the model is ready are dropped
+            if not self.is_ready():
+                continue
+            
+            # Scene unchanged, keep the previous results (the run stays due)
+            if self.motion_gate is not None and not self.motion_gate.should_run(self._working_frame):
+                self._reuse_results(timestamp)
+                continue
+            
+            self.scheduler.mark_run()
+            self.last_detection_time = time.time()
+            
+            detected_objects = self._run_inference(self._working_frame)
+            if detected_objects is not None:
+                self.scheduler.record_latency(self.inference_time)
+                self._publish_results(detected_objects, frame_id, timestamp)
+    
+    def check_target_found(self, target_object, threshold=None):
+        """Check if target object is found
+        
+        The target must win the vote over the recent inference runs (see
+        DETECTION["vote_mode"]); with tracking enabled it must also be a
+        confirmed track that is still in view.
+        
+        Args:
+            target_object: Target class name
+            threshold: Minimum confidence, defaults to the detection threshold
+        """
+        target_id = self.get_class_id(target_object)
+        if target_id is None or self.confidence_history is None:
+            return False
+        
+        threshold = self.confidence_threshold if threshold is None else threshold
+        if not self.confidence_history.confirmed(target_id, threshold):
+            return False
+        
+        if self.tracker is not None:
+            tracks = self.get_tracks()
+            confirmed = (tracks["class_id"] == target_id) & (tracks["hits"] >= DETECTION["track_min_hits"])
+            return bool(confirmed.any())
+        
+        return True
     
     def draw_detection_boxes(self, frame, target_object=None):
-        """Draw detection boxes on image"""
-        for i, (obj_name, confidence, box) in enumerate(self.detection_results):
+        """Draw detection boxes on image
+        
+        With tracking enabled the boxes are predicted forward to the current
+        time, so they follow moving objects between inference runs.
+        """
+        tracks = self.get_tracks()
+        for obj_name, confidence, box in self.as_tuples(tracks):
             x1, y1, x2, y2 = box
             
             # Set color - green for target object, yellow for others
@@ -186,11 +817,11 @@ class ObjectDetector:
     
     def get_detection_summary(self, max_items=5):
         """Get detection results summary"""
-        if not self.detection_results:
+        if not len(self.detection_results):
             return "No objects detected"
         
         # Get names of top N detections
-        objects = [obj[0] for obj in self.detection_results[:max_items]]
+        objects = [self.get_class_name(class_id) for class_id in self.detection_results["class_id"][:max_items]]
         
         # Add ellipsis if there are more results
         if len(self.detection_results) > max_items:
@@ -200,4 +831,11 @@ class ObjectDetector:
     
     def reset_history(self):
         """Reset detection history"""
-        self.detection_history = [] 
\ No newline at end of file
+        with self._lock:
+            if self.confidence_history is not None:
+                self.confidence_history.clear()
+            if self.tracker is not None:
+                self.tracker.clear()
+            self.focus_box = None
+        if self.motion_gate is not None:
+            self.motion_gate.reset() 
\ No newline at end of file
@@ -0,0 +1,257 @@
+"""
+Particle System - Structure-of-arrays particle effects with NumPy physics
+"""
+import time
+
+import cv2
+import numpy as np
+
+# Particle shapes, stored as small integer codes
+CIRCLE, STAR, SPARKLE, TRIANGLE = range(4)
+
+# Per-shape spawn parameters, indexed by shape code:
+# size range, x velocity range, y velocity range, gravity, velocity decay range
+_SIZE_RANGE = np.array([(3, 8), (4, 10), (1, 3), (4, 8)], dtype=np.float32)
+_VX_RANGE = np.array([(-3, 3), (-2, 2), (-4, 4), (-3, 3)], dtype=np.float32)
+_VY_RANGE = np.array([(-5, -1), (-4, -0.5), (-4, 4), (-3, -0.5)], dtype=np.float32)
+_GRAVITY = np.array([0.1, 0.05, 0.02, 0.07], dtype=np.float32)
+_DECAY_RANGE = np.array([(0.95, 0.99), (0.97, 0.99), (0.9, 0.95), (0.96, 0.98)], dtype=np.float32)
+
+# Per-frame shrink factor, sparkles fade out faster
+_SHRINK = np.array([0.995, 0.995, 0.98, 0.995], dtype=np.float32)
+
+# Unit vertex angles for each batched shape
+_STAR_ANGLES = np.pi * np.arange(10) / 5
+_STAR_INNER = np.arange(10) % 2 == 1
+_SPARKLE_ANGLES = np.pi * np.arange(4) / 2
+_TRIANGLE_ANGLES = np.pi * 2 * np.arange(3) / 3
+
+
+class ParticleSystem:
+    """Particle effects stored in preallocated NumPy arrays"""
+    
+    def __init__(self, capacity=512, lifetime=2.0):
+        """Initialize particle system
+        
+        Args:
+            capacity: Number of particles allocated up front (grows if exceeded)
+            lifetime: Particle lifetime in seconds
+        """
+        self.lifetime = lifetime
+        self.count = 0
+        self.rng = np.random.default_rng()
+        self._allocate(capacity)
+    
+    def _allocate(self, capacity):
+        """Allocate (or grow) the particle arrays, keeping live particles"""
+        old = getattr(self, "position", None)
+        live = self.count
+        
+        arrays = {
+            "position": ((capacity, 2), np.float32),
+            "velocity": ((capacity, 2), np.float32),
+            "acceleration": ((capacity, 2), np.float32),
+            "decay": ((capacity,), np.float32),
+            "size": ((capacity,), np.float32),
+            "rotation": ((capacity,), np.float32),
+            "rotation_speed": ((capacity,), np.float32),
+            "alpha": ((capacity,), np.int32),
+            "created": ((capacity,), np.float64),
+            "kind": ((capacity,), np.int8),
+            "color": ((capacity, 3), np.int32)
+        }
+        
+        for name, (shape, dtype) in arrays.items():
+            array = np.zeros(shape, dtype=dtype)
+            if old is not None and live:
+                array[:live] = getattr(self, name)[:live]
+            setattr(self, name, array)
+        
+        self.capacity = capacity
+    
+    def emit(self, x, y, color, count=1, spread=0, now=None):
+        """Spawn a burst of particles with random shapes
+        
+        Args:
+            x: Spawn x coordinate
+            y: Spawn y coordinate
+            color: Base color (B,G,R), brightness is varied per particle
+            count: Number of particles
+            spread: Spawn positions are jittered by up to this many pixels
+            now: Spawn time, defaults to time.time()
+        """
+        if count <= 0:
+            return
+        
+        if self.count + count > self.capacity:
+            self._allocate(max(self.capacity * 2, self.count + count))
+        
+        rng = self.rng
+        start, end = self.count, self.count + count
+        kind = rng.integers(0, 4, count)
+        
+        if spread > 0:
+            self.position[start:end, 0] = rng.integers(x - spread, x + spread + 1, count)
+            self.position[start:end, 1] = rng.integers(y - spread, y + spread + 1, count)
+        else:
+            self.position[start:end] = (x, y)
+        
+        def uniform(ranges):
+            return rng.uniform(ranges[kind, 0], ranges[kind, 1])
+        
+        self.size[start:end] = uniform(_SIZE_RANGE)
+        self.velocity[start:end, 0] = uniform(_VX_RANGE)
+        self.velocity[start:end, 1] = uniform(_VY_RANGE)
+        self.acceleration[start:end, 0] = 0
+        self.acceleration[start:end, 1] = _GRAVITY[kind]
+        self.decay[start:end] = uniform(_DECAY_RANGE)
+        self.rotation[start:end] = rng.uniform(0, 360, count)
+        self.rotation_speed[start:end] = rng.uniform(-5, 5, count)
+        self.alpha[start:end] = 255
+        self.created[start:end] = time.time() if now is None else now
+        self.kind[start:end] = kind
+        
+        # Randomly vary brightness of the base color
+        brightness = rng.uniform(0.7, 1.3, (count, 1))
+        base = np.asarray(color[:3], dtype=np.float64)
+        self.color[start:end] = np.minimum(255, (base * brightness).astype(np.int32))
+        
+        self.count = end
+    
+    def update(self, now=None):
+        """Expire old particles and advance the physics by one frame"""
+        if self.count == 0:
+            return
+        
+        now = time.time() if now is None else now
+        n = self.count
+        age = now - self.created[:n]
+        alive = age < self.lifetime
+        
+        # Compact live particles to the front of the arrays
+        if not alive.all():
+            live = int(np.count_nonzero(alive))
+            for name in ("position", "velocity", "acceleration", "decay", "size",
+                         "rotation", "rotation_speed", "alpha", "created", "kind", "color"):
+                array = getattr(self, name)
+                array[:live] = array[:n][alive]
+            age = age[alive]
+            n = self.count = live
+            if n == 0:
+                return
+        
+        position = self.position[:n]
+        velocity = self.velocity[:n]
+        
+        position += velocity
+        velocity += self.acceleration[:n]
+        velocity *= self.decay[:n, None]
+        
+        self.alpha[:n] = (255 * (1 - age / self.lifetime)).astype(np.int32)
+        self.rotation[:n] += self.rotation_speed[:n]
+        self.size[:n] *= _SHRINK[self.kind[:n]]
+    
+    def clear(self):
+        """Remove all particles"""
+        self.count = 0
+    
+    def __len__(self):
+        return self.count
+    
+    def draw(self, frame):
+        """Draw all particles onto the frame"""
+        n = self.count
+        if n == 0:
+            return frame
+        
+        h, w = frame.shape[:2]
+        xy = self.position[:n].astype(np.int32)
+        
+        # Skip particles outside the frame
+        visible = (xy[:, 0] >= 0) & (xy[:, 1] >= 0) & (xy[:, 0] < w) & (xy[:, 1] < h)
+        if not visible.any():
+            return frame
+        
+        xy = xy[visible]
+        size = self.size[:n][visible].astype(np.int32)
+        kind = self.kind[:n][visible]
+        rotation = np.radians(self.rotation[:n][visible].astype(np.float64))
+        colors = self.color[:n][visible]
+        
+        self._draw_circles(frame, xy, size, colors, kind == CIRCLE)
+        self._draw_stars(frame, xy, size, rotation, colors, kind == STAR)
+        self._draw_sparkles(frame, xy, size, rotation, colors, kind == SPARKLE)
+        self._draw_triangles(frame, xy, size, rotation, colors, kind == TRIANGLE)
+        return frame
+    
+    @staticmethod
+    def _draw_circles(frame, xy, size, colors, selected):
+        """Filled circles with a three-ring glow"""
+        for (x, y), radius, color in zip(xy[selected].tolist(), size[selected].tolist(),
+                                         colors[selected].tolist()):
+            cv2.circle(frame, (x, y), radius, color, -1, cv2.LINE_AA)
+            for i in range(1, 4):
+                cv2.circle(frame, (x, y), radius + i * 2, color, 1, cv2.LINE_AA)
+    
+    @staticmethod
+    def _draw_stars(frame, xy, size, rotation, colors, selected):
+        """Five-pointed stars, all vertices computed in one batch"""
+        if not selected.any():
+            return
+        
+        size = size[selected]
+        radius = np.where(_STAR_INNER, (size // 2)[:, None], size[:, None])
+        angle = _STAR_ANGLES + rotation[selected][:, None]
+        points = _polygon_points(xy[selected], radius, angle)
+        
+        for polygon, color in zip(points, colors[selected].tolist()):
+            cv2.fillPoly(frame, [polygon], color, cv2.LINE_AA)
+    
+    def _draw_sparkles(self, frame, xy, size, rotation, colors, selected):
+        """Sparkles with four rays and a per-frame flicker"""
+        if not selected.any():
+            return
+        
+        xy = xy[selected]
+        size = size[selected]
+        flicker = self.rng.uniform(0.7, 1.0, (len(size), 1))
+        flicker_colors = np.minimum(255, (colors[selected] * flicker).astype(np.int32))
+        
+        ray_length = (size * 3)[:, None]
+        angle = _SPARKLE_ANGLES + rotation[selected][:, None]
+        ends = _polygon_points(xy, ray_length, angle)
+        
+        for (x, y), radius, color, rays in zip(xy.tolist(), size.tolist(),
+                                               flicker_colors.tolist(), ends.tolist()):
+            cv2.circle(frame, (x, y), radius, color, -1, cv2.LINE_AA)
+            for end in rays:
+                cv2.line(frame, (x, y), tuple(end), color, 1, cv2.LINE_AA)
+    
+    @staticmethod
+    def _draw_triangles(frame, xy, size, rotation, colors, selected):
+        """Rotated triangles, all vertices computed in one batch"""
+        if not selected.any():
+            return
+        
+        side = (size[selected] * 2)[:, None]
+        angle = _TRIANGLE_ANGLES + rotation[selected][:, None]
+        points = _polygon_points(xy[selected], side, angle)
+        
+        for polygon, color in zip(points, colors[selected].tolist()):
+            cv2.fillPoly(frame, [polygon], color, cv2.LINE_AA)
+
+
+def _polygon_points(center, radius, angle):
+    """Vertices at the given radii and angles around each center
+    
+    Args:
+        center: (N, 2) int centers
+        radius: (N, K) or (N, 1) radii
+        angle: (N, K) angles in radians
+    
+    Returns:
+        np.ndarray: (N, K, 2) int32 vertices
+    """
+    offsets = np.stack((np.trunc(radius * np.cos(angle)),
+                        np.trunc(radius * np.sin(angle))), axis=-1)
+    return (center[:, None, :] + offsets).astype(np.int32)
@@ -0,0 +1,277 @@
+"""
+Process Detector - Runs YOLO inference in a separate process, frames passed through shared memory
+"""
+import multiprocessing
+import queue
+import signal
+import threading
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from config import DETECTION, PATHS
+from object_detector import ObjectDetector
+
+
+class SharedFrameRing:
+    """Frame slots in one shared memory block"""
+    
+    def __init__(self, shape, slots=2):
+        """Initialize ring
+        
+        Args:
+            shape: Frame shape (uint8)
+            slots: Number of frame slots
+        """
+        self.shape = tuple(shape)
+        self.slot_bytes = int(np.prod(shape))
+        self.shm = shared_memory.SharedMemory(create=True, size=self.slot_bytes * slots)
+        self.views = [np.ndarray(self.shape, dtype=np.uint8, buffer=self.shm.buf, offset=i * self.slot_bytes)
+                      for i in range(slots)]
+    
+    def index_of(self, frame):
+        """Slot index of a frame view, or None if the frame is not in the ring"""
+        for index, view in enumerate(self.views):
+            if frame is view:
+                return index
+        return None
+    
+    def close(self):
+        """Release and remove the shared memory block
+        
+        The block is unlinked even if a frame view is still alive somewhere
+        and the mapping cannot be closed yet, so it never outlives the game.
+        """
+        # Drop the ring's own views first, they keep the buffer exported
+        self.views = []
+        try:
+            self.shm.close()
+        except BufferError as e:
+            print(f"Shared frame memory still in use, unmapping it later: {e}")
+        finally:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _inference_process(requests, results, detection, model_path):
+    """Entry point of the inference process
+    
+    Loads the model, then answers requests until it receives None. A
+    request names a frame slot in shared memory, only the small result
+    array is sent back.
+    """
+    # Ctrl+C is handled by the game process, which shuts this one down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    
+    DETECTION.update(detection)
+    PATHS["model"] = model_path
+    
+    try:
+        detector = ObjectDetector()
+    except Exception as e:
+        results.put(("failed", str(e)))
+        return
+    results.put(("ready", detector.class_names, detector.load_time, detector.backend, detector.model_path))
+    
+    attached = {}
+    while True:
+        request = requests.get()
+        if request is None:
+            break
+        
+        request_id, name, offset, shape, classes, size, focus_box = request
+        if name not in attached:
+            # Spawned processes share the game process' resource tracker, which removes the block on exit
+            attached[name] = shared_memory.SharedMemory(name=name)
+        frame = np.ndarray(shape, dtype=np.uint8, buffer=attached[name].buf, offset=offset)
+        
+        detector.active_classes = classes
+        detector.current_inference_size = size
+        detector.focus_box = focus_box
+        detected_objects = detector._run_inference(frame)
+        results.put(("result", request_id, detected_objects, detector.inference_time,
+                     detector.current_inference_size))
+        del frame
+    
+    for shm in attached.values():
+        shm.close()
+
+
+class ProcessDetector(ObjectDetector):
+    """ObjectDetector whose inference runs in a child process
+    
+    Scheduling, the motion gate, tracking and target confirmation stay in
+    the game process; only the model call moves out, so it no longer shares
+    the GIL with drawing and the event loop. Frames are written straight
+    into shared memory by submit_frame and never pickled. The process is
+    restarted if it dies.
+    """
+    
+    def __init__(self, load_in_background=False, timeout=None):
+        """Initialize process detector
+        
+        Args:
+            load_in_background: Return before the model has loaded (see is_ready)
+            timeout: Seconds to wait for one inference result before the
+                     process is considered hung, defaults to DETECTION["process_timeout"]
+        """
+        super().__init__(load_model=False)
+        self.timeout = DETECTION.get("process_timeout", 10.0) if timeout is None else timeout
+        self.restarts = 0
+        
+        self._context = multiprocessing.get_context("spawn")
+        self._process = None
+        self._requests = None
+        self._results = None
+        self._request_id = 0
+        self._ring = None
+        self._retired_rings = []  # Rings replaced after a frame size change, released on close
+        
+        self.start_loading()
+        if not load_in_background:
+            self._loader.join()
+    
+    def detect_objects(self, frame):
+        """Detect objects in image, always through the async worker thread"""
+        if not self.async_mode:
+            self.start_async()
+        return super().detect_objects(frame)
+    
+    def start_loading(self):
+        """Start the inference process and wait for its model on a background thread"""
+        if self._loader is not None and self._loader.is_alive():
+            return
+        
+        self.state = "loading"
+        self._requests = self._context.Queue()
+        self._results = self._context.Queue()
+        self._process = self._context.Process(target=_inference_process,
+                                              args=(self._requests, self._results, dict(DETECTION), PATHS["model"]),
+                                              name="ObjectDetectorProcess",
+                                              daemon=True)
+        self._process.start()
+        self._loader = threading.Thread(target=self._wait_for_model,
+                                        name="ObjectDetectorLoader",
+                                        daemon=True)
+        self._loader.start()
+    
+    def _wait_for_model(self):
+        """Loader thread, waits for the ready message of the inference process"""
+        start_time = time.perf_counter()
+        message = self._receive(timeout=None)
+        if message is None or message[0] != "ready":
+            self.load_error = message[1] if message else "inference process exited"
+            self.state = "failed"
+            print(f"Object detector failed to load: {self.load_error}")
+            return
+        
+        _, names, load_time, self.backend, self.model_path = message
+        self._build_class_map(names)
+        self.load_time = time.perf_counter() - start_time
+        self.state = "ready"
+        print(f"Object detector process ready after {self.load_time:.1f}s (model {load_time:.1f}s)")
+    
+    def _receive(self, timeout):
+        """Read a message from the inference process
+        
+        Args:
+            timeout: Seconds to wait, None to wait as long as the process is alive
+        
+        Returns:
+            tuple: The message, or None if the process died or timed out
+        """
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while True:
+            try:
+                return self._results.get(timeout=0.5)
+            except queue.Empty:
+                if not self._process.is_alive():
+                    return None
+                if deadline is not None and time.perf_counter() > deadline:
+                    return None
+    
+    def submit_frame(self, frame, timestamp=None):
+        """Queue a frame, copying it straight into shared memory"""
+        with self._lock:
+            if self._ring is None or self._ring.shape != frame.shape:
+                self._replace_ring(frame.shape)
+        return super().submit_frame(frame, timestamp)
+    
+    def _replace_ring(self, shape):
+        """Allocate the shared slots for a frame shape (called with the lock held)"""
+        if self._ring is not None:
+            # The worker may still be reading the old slots, release them on close
+            self._retired_rings.append(self._ring)
+        self._ring = SharedFrameRing(shape, slots=2)
+        self._pending_frame, self._working_frame = self._ring.views
+    
+    def _run_inference(self, frame):
+        """Run the model in the inference process
+        
+        Returns:
+            np.ndarray: Top detections as a DETECTION_DTYPE array, or None if
+                        inference failed
+        """
+        ring = self._ring
+        slot = ring.index_of(frame) if ring is not None else None
+        if slot is None:
+            print("Frame is not in shared memory, skipping inference")
+            return None
+        
+        self._request_id += 1
+        self._requests.put((self._request_id, ring.shm.name, slot * ring.slot_bytes, frame.shape,
+                            self.active_classes, self.current_inference_size, self.focus_box))
+        
+        # Skip results of requests that timed out earlier
+        while True:
+            message = self._receive(timeout=self.timeout)
+            if message is None:
+                self._restart()
+                return None
+            if message[0] == "result" and message[1] == self._request_id:
+                break
+        
+        _, _, detected_objects, self.inference_time, self.current_inference_size = message
+        return detected_objects
+    
+    def _restart(self):
+        """Replace a crashed or hung inference process"""
+        self.restarts += 1
+        print(f"Inference process stopped responding, restarting it (restart {self.restarts})")
+        self._stop_process(timeout=1.0)
+        self._loader = None
+        self.start_loading()
+    
+    def _stop_process(self, timeout=2.0):
+        """Ask the inference process to exit, terminating it if it does not"""
+        if self._process is None:
+            return
+        
+        if self._process.is_alive():
+            try:
+                self._requests.put(None)
+            except Exception:
+                pass
+            self._process.join(timeout)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join(timeout)
+        self._process = None
+    
+    def close(self):
+        """Stop the worker and the inference process and release shared memory"""
+        self.stop_async()
+        self._stop_process()
+        
+        with self._lock:
+            rings = self._retired_rings + ([self._ring] if self._ring is not None else [])
+            self._ring = None
+            self._retired_rings = []
+            self._pending_frame = None
+            self._working_frame = None
+        for ring in rings:
+            ring.close()
+        print("Inference process stopped")
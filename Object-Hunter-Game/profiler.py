@@ -0,0 +1,256 @@
+"""
+Frame Profiler - Opt-in per-stage timing and on-screen performance HUD
+"""
+import csv
+import json
+import os
+import time
+from contextlib import nullcontext
+
+import cv2
+import numpy as np
+
+# Shared no-op context returned when profiling is disabled
+_NULL_STAGE = nullcontext()
+
+
+class RingBuffer:
+    """Fixed-size ring buffer of float samples"""
+    
+    def __init__(self, capacity=300):
+        """Initialize ring buffer
+        
+        Args:
+            capacity: Number of most recent samples kept
+        """
+        self.values = np.zeros(capacity, dtype=np.float64)
+        self.capacity = capacity
+        self.index = 0
+        self.count = 0
+    
+    def push(self, value):
+        """Add a sample, overwriting the oldest one when full"""
+        self.values[self.index] = value
+        self.index = (self.index + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+    
+    def samples(self):
+        """Get the stored samples (unordered)"""
+        return self.values[:self.count]
+    
+    def latest(self):
+        """Get the most recent sample, or 0 if empty"""
+        if self.count == 0:
+            return 0.0
+        return self.values[self.index - 1]
+    
+    def percentiles(self, quantiles=(50, 95, 99)):
+        """Get percentiles of the stored samples"""
+        if self.count == 0:
+            return [0.0] * len(quantiles)
+        return np.percentile(self.samples(), quantiles).tolist()
+
+
+class _Stage:
+    """Context manager that adds its elapsed time to the current frame"""
+    
+    __slots__ = ("profiler", "name", "start")
+    
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0
+    
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler.add(self.name, time.perf_counter_ns() - self.start)
+        return False
+
+
+class FrameProfiler:
+    """Times each stage of the game loop and keeps rolling latency percentiles"""
+    
+    def __init__(self, enabled=False, window=300):
+        """Initialize profiler
+        
+        Args:
+            enabled: Whether timings are collected
+            window: Number of frames kept for percentiles
+        """
+        self.enabled = enabled
+        self.window = window
+        self.hud_visible = False
+        
+        self.stages = {}       # Stage name -> RingBuffer of per-frame milliseconds
+        self.events = {}       # Event name -> RingBuffer of timestamps (seconds)
+        self._frame_ns = {}    # Stage name -> nanoseconds accumulated this frame
+        self._frame_start = 0
+        
+        # HUD text is refreshed a few times per second, not every frame
+        self._hud_lines = []
+        self._hud_updated = 0
+        self.hud_interval = 0.25
+    
+    def stage(self, name):
+        """Time a block of code as part of the current frame
+        
+        Nested or repeated stages with the same name are summed per frame.
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+    
+    def add(self, name, elapsed_ns):
+        """Add elapsed nanoseconds to a stage of the current frame"""
+        self._frame_ns[name] = self._frame_ns.get(name, 0) + elapsed_ns
+    
+    def record(self, name, value_ms):
+        """Record a sample that is not measured by a stage (e.g. inference latency)"""
+        if not self.enabled:
+            return
+        self._buffer(self.stages, name).push(value_ms)
+    
+    def mark(self, name, timestamp=None):
+        """Record an occurrence of an event, used to compute its rate"""
+        if not self.enabled:
+            return
+        self._buffer(self.events, name).push(time.perf_counter() if timestamp is None else timestamp)
+    
+    def begin_frame(self):
+        """Start timing a frame"""
+        if not self.enabled:
+            return
+        self._frame_ns.clear()
+        self._frame_start = time.perf_counter_ns()
+    
+    def end_frame(self):
+        """Finish a frame and push its stage timings into the ring buffers"""
+        if not self.enabled or not self._frame_start:
+            return
+        
+        self._frame_ns["frame"] = time.perf_counter_ns() - self._frame_start
+        for name, elapsed_ns in self._frame_ns.items():
+            self._buffer(self.stages, name).push(elapsed_ns / 1e6)
+        self.mark("frame")
+    
+    def _buffer(self, buffers, name):
+        """Get or create the ring buffer for a name"""
+        buffer = buffers.get(name)
+        if buffer is None:
+            buffer = buffers[name] = RingBuffer(self.window)
+        return buffer
+    
+    def rate(self, name):
+        """Events per second over the stored window"""
+        buffer = self.events.get(name)
+        if buffer is None or buffer.count < 2:
+            return 0.0
+        samples = buffer.samples()
+        span = samples.max() - samples.min()
+        return (buffer.count - 1) / span if span > 0 else 0.0
+    
+    def get_stats(self):
+        """Get rolling statistics
+        
+        Returns:
+            dict: fps, inference_fps and per-stage p50/p95/p99/mean in milliseconds
+        """
+        stats = {
+            "fps": self.rate("frame"),
+            "inference_fps": self.rate("inference"),
+            "stages": {}
+        }
+        for name, buffer in self.stages.items():
+            p50, p95, p99 = buffer.percentiles()
+            stats["stages"][name] = {
+                "p50": p50,
+                "p95": p95,
+                "p99": p99,
+                "mean": float(buffer.samples().mean()) if buffer.count else 0.0,
+                "samples": buffer.count
+            }
+        return stats
+    
+    def toggle_hud(self):
+        """Show or hide the HUD, enabling collection the first time it is shown"""
+        self.hud_visible = not self.hud_visible
+        if self.hud_visible:
+            self.enabled = True
+        return self.hud_visible
+    
+    def draw_hud(self, frame, origin=(10, 90)):
+        """Draw the compact performance HUD onto the frame"""
+        if not self.hud_visible:
+            return frame
+        
+        now = time.perf_counter()
+        if now - self._hud_updated >= self.hud_interval:
+            self._hud_lines = self._format_hud()
+            self._hud_updated = now
+        
+        if not self._hud_lines:
+            return frame
+        
+        x, y = origin
+        line_height = 18
+        width = 330
+        height = line_height * len(self._hud_lines) + 10
+        h, w = frame.shape[:2]
+        x2, y2 = min(w, x + width), min(h, y + height)
+        if x2 <= x or y2 <= y:
+            return frame
+        
+        # Darken the HUD background
+        roi = frame[y:y2, x:x2]
+        cv2.multiply(roi, (0.35, 0.35, 0.35, 0), dst=roi)
+        
+        for i, line in enumerate(self._hud_lines):
+            cv2.putText(frame, line, (x + 6, y + 16 + i * line_height),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.45, (255, 255, 255), 1, cv2.LINE_AA)
+        return frame
+    
+    def _format_hud(self):
+        """Build the HUD text lines from the current statistics"""
+        stats = self.get_stats()
+        lines = [f"FPS {stats['fps']:5.1f}   Inference {stats['inference_fps']:4.1f}/s"]
+        lines.append(f"{'stage':<10}{'p50':>8}{'p95':>8}{'p99':>8}  ms")
+        for name, stage in stats["stages"].items():
+            lines.append(f"{name:<10}{stage['p50']:8.2f}{stage['p95']:8.2f}{stage['p99']:8.2f}")
+        return lines
+    
+    def export(self, path):
+        """Write the statistics to a JSON or CSV file (chosen by extension)
+        
+        Returns:
+            bool: Success status
+        """
+        if not self.stages:
+            return False
+        
+        stats = self.get_stats()
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            
+            if path.lower().endswith(".csv"):
+                with open(path, "w", newline="") as f:
+                    writer = csv.writer(f)
+                    writer.writerow(["stage", "p50_ms", "p95_ms", "p99_ms", "mean_ms", "samples"])
+                    for name, stage in stats["stages"].items():
+                        writer.writerow([name, f"{stage['p50']:.3f}", f"{stage['p95']:.3f}",
+                                         f"{stage['p99']:.3f}", f"{stage['mean']:.3f}", stage["samples"]])
+                    writer.writerow(["fps", f"{stats['fps']:.2f}", "", "", "", ""])
+                    writer.writerow(["inference_fps", f"{stats['inference_fps']:.2f}", "", "", "", ""])
+            else:
+                with open(path, "w") as f:
+                    json.dump(stats, f, indent=2)
+            
+            print(f"Performance stats exported to {path}")
+            return True
+        except Exception as e:
+            print(f"Failed to export performance stats: {e}")
+            return False
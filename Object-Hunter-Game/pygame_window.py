@@ -11,13 +11,14 @@ import os
 class PygameWindow:
     """Pygame-based window manager"""
     
-    def __init__(self, window_name, width=1280, height=720):
+    def __init__(self, window_name, width=1280, height=720, fast_blit=True):
         """Initialize Pygame window
         
         Args:
             window_name: Window title
             width: Window width
             height: Window height
+            fast_blit: Wrap BGR frames directly instead of converting them to RGB first
         """
         self.window_name = window_name
         self.width = width
@@ -29,6 +30,8 @@ class PygameWindow:
         self.mouse_move_callback_fn = None  # Add mouse move callback
         self.last_key = -1  # Store last key pressed
         self.font = None    # Font property
+        self.fast_blit = fast_blit
+        self.fps_limit = 30  # Frame rate cap applied in show(), 0 for uncapped
     
     def _init_font(self):
         """Initialize font"""
@@ -121,6 +124,28 @@ class PygameWindow:
         
         return pygame_frame
     
+    def _wrap_cv_frame(self, cv_frame):
+        """Wrap an OpenCV BGR image as a Pygame surface without copying
+        
+        The surface shares memory with cv_frame, so it is only valid until
+        the frame is modified. Blitting it onto the display surface performs
+        the single BGR->RGB copy that is needed.
+        
+        Args:
+            cv_frame: OpenCV image
+        
+        Returns:
+            pygame.Surface: Pygame image, or None if the frame can't be wrapped
+        """
+        if cv_frame.ndim != 3 or cv_frame.shape[2] != 3 or cv_frame.dtype != np.uint8:
+            return None
+        
+        if not cv_frame.flags["C_CONTIGUOUS"]:
+            cv_frame = np.ascontiguousarray(cv_frame)
+        
+        height, width = cv_frame.shape[:2]
+        return pygame.image.frombuffer(cv_frame, (width, height), "BGR")
+    
     def show(self, frame):
         """Display frame
         
@@ -136,7 +161,9 @@ class PygameWindow:
         
         try:
             # Convert OpenCV image to Pygame image
-            pygame_frame = self._convert_cv_to_pygame(frame)
+            pygame_frame = self._wrap_cv_frame(frame) if self.fast_blit else None
+            if pygame_frame is None:
+                pygame_frame = self._convert_cv_to_pygame(frame)
             
             # Display image
             self.screen.blit(pygame_frame, (0, 0))
@@ -146,7 +173,7 @@ class PygameWindow:
             self._process_events()
             
             # Control frame rate
-            self.clock.tick(30)
+            self.clock.tick(self.fps_limit)
             
             return True
         except Exception as e:
@@ -242,3 +269,61 @@ def create_pygame_window(window_name, width=1280, height=720):
     manager = PygameWindow(window_name, width, height)
     manager.create()
     return manager
+
+def benchmark_present(frames=300, width=1280, height=720):
+    """Compare presentation throughput of the RGB-convert and direct BGR paths
+    
+    Args:
+        frames: Number of frames to present per path
+        width: Frame width
+        height: Frame height
+        
+    Returns:
+        dict: Frames per second for each path
+    """
+    window = PygameWindow("Present benchmark", width, height)
+    if not window.create():
+        return {}
+    
+    # Pre-generate a few noisy frames so each iteration uploads new data
+    rng = np.random.default_rng(0)
+    test_frames = [rng.integers(0, 256, (height, width, 3), dtype=np.uint8) for _ in range(4)]
+    
+    paths = {
+        "convert_rgb": window._convert_cv_to_pygame,
+        "direct_bgr": window._wrap_cv_frame
+    }
+    
+    results = {}
+    for name, convert in paths.items():
+        start_time = time.perf_counter()
+        for i in range(frames):
+            surface = convert(test_frames[i % len(test_frames)])
+            window.screen.blit(surface, (0, 0))
+            pygame.display.flip()
+            pygame.event.pump()
+        elapsed = time.perf_counter() - start_time
+        results[name] = frames / elapsed
+        print(f"{name:>12}: {results[name]:7.1f} FPS ({elapsed / frames * 1000:.2f} ms/frame)")
+    
+    if results.get("convert_rgb"):
+        print(f"Speedup: {results['direct_bgr'] / results['convert_rgb']:.2f}x")
+    
+    window.destroy()
+    return results
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Frame presentation micro-benchmark")
+    parser.add_argument("--frames", type=int, default=300, help="Frames per path")
+    parser.add_argument("--width", type=int, default=1280, help="Frame width")
+    parser.add_argument("--height", type=int, default=720, help="Frame height")
+    parser.add_argument("--headless", action="store_true", help="Use the SDL dummy video driver")
+    args = parser.parse_args()
+    
+    if args.headless:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+    
+    benchmark_present(args.frames, args.width, args.height)
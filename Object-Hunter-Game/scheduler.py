@@ -0,0 +1,112 @@
+"""
+Detection Scheduler - Picks the inference rate from measured latency, frame budget and game state
+"""
+import math
+import time
+
+# Game states the scheduler distinguishes
+STATES = ("active", "game_over", "menu")
+
+
+class DetectionScheduler:
+    """Decides when the next inference run is due"""
+    
+    def __init__(self, target_fps=30, active_duty=1.0, game_over_interval=1.0,
+                 min_interval=0.0, fixed_interval=None):
+        """Initialize scheduler
+        
+        Args:
+            target_fps: Render rate to protect; inference backs off while frames take longer
+            active_duty: Share of wall time spent on inference during a round (1.0 = back to back)
+            game_over_interval: Minimum seconds between runs on the game over screen
+            min_interval: Minimum seconds between runs in any state
+            fixed_interval: Use a fixed interval instead of adapting (the old cooldown)
+        """
+        self.target_fps = target_fps
+        self.active_duty = active_duty
+        self.game_over_interval = game_over_interval
+        self.min_interval = min_interval
+        self.fixed_interval = fixed_interval
+        
+        self.state = "menu"
+        self.latency = 0.0        # Inference latency EMA (seconds)
+        self.frame_time = 0.0     # Render work per frame EMA (seconds)
+        self.smoothing = 0.2
+        self.last_run = 0
+        self.runs = 0
+        self._run_times = []      # Recent run timestamps, for the observed rate
+    
+    def set_state(self, state):
+        """Set the game state ("active", "game_over" or "menu")"""
+        if state not in STATES:
+            raise ValueError(f"Unknown scheduler state: {state}")
+        self.state = state
+    
+    def record_latency(self, seconds):
+        """Record the duration of an inference run"""
+        self.latency = seconds if not self.latency else self.latency * (1 - self.smoothing) + seconds * self.smoothing
+    
+    def record_frame(self, seconds):
+        """Record the render work of one frame"""
+        self.frame_time = seconds if not self.frame_time else self.frame_time * (1 - self.smoothing) + seconds * self.smoothing
+    
+    def interval(self):
+        """Seconds between inference runs in the current state (inf when stopped)"""
+        if self.state == "menu":
+            return math.inf
+        
+        if self.fixed_interval is not None:
+            interval = self.fixed_interval
+        else:
+            interval = self.latency / self.active_duty
+            # Frames are over budget, inference competes with rendering for the CPU
+            budget = 1.0 / self.target_fps
+            if self.frame_time > budget:
+                interval *= self.frame_time / budget
+            interval = max(interval, self.min_interval)
+        
+        if self.state == "game_over":
+            interval = max(interval, self.game_over_interval)
+        return interval
+    
+    def time_until_next(self, now=None):
+        """Seconds until the next run is due
+        
+        Returns:
+            float: 0 if a run is due now, or None if inference is stopped
+        """
+        interval = self.interval()
+        if math.isinf(interval):
+            return None
+        now = time.time() if now is None else now
+        return max(0.0, self.last_run + interval - now)
+    
+    def mark_run(self, now=None):
+        """Record that an inference run is starting"""
+        now = time.time() if now is None else now
+        self.last_run = now
+        self.runs += 1
+        self._run_times.append(now)
+        if len(self._run_times) > 30:
+            self._run_times.pop(0)
+    
+    def get_stats(self):
+        """Get the current scheduling decision and its inputs
+        
+        Returns:
+            dict: state, interval, latency, frame_time, frame_budget (seconds),
+                  runs and the observed inference rate (runs per second)
+        """
+        rate = 0.0
+        if len(self._run_times) > 1:
+            span = self._run_times[-1] - self._run_times[0]
+            rate = (len(self._run_times) - 1) / span if span > 0 else 0.0
+        return {
+            "state": self.state,
+            "interval": self.interval(),
+            "latency": self.latency,
+            "frame_time": self.frame_time,
+            "frame_budget": 1.0 / self.target_fps,
+            "runs": self.runs,
+            "inference_rate": rate
+        }
@@ -0,0 +1,152 @@
+"""
+Synthetic Camera - Camera stand-in fed from a video file, image sequence or generated frames
+"""
+import glob
+import os
+import time
+
+import cv2
+import numpy as np
+
+
+class SyntheticCamera:
+    """Frame source with the DirectCamera interface, for headless runs"""
+    
+    def __init__(self, source="procedural", width=1280, height=720, fps=None, loop=True):
+        """Initialize synthetic camera
+        
+        Args:
+            source: "procedural", a video file path, an image directory or a glob pattern
+            width: Output frame width
+            height: Output frame height
+            fps: Pace read() to this frame rate, None to return frames as fast as possible
+            loop: Restart video / image sequences when they run out
+        """
+        self.source = source
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.loop = loop
+        
+        self.frame_seq = 0
+        self.frame_timestamp = 0
+        self.last_frame = None
+        self.initialized = False
+        
+        self._video = None
+        self._images = []
+        self._next_time = 0
+        self._buffer = np.zeros((height, width, 3), dtype=np.uint8)
+        self._decoded = None      # Video decode buffer
+        
+        self.initialize()
+    
+    def initialize(self):
+        """Open the frame source"""
+        self.release()
+        
+        if self.source == "procedural":
+            self._background = self._make_background()
+            self.initialized = True
+        elif os.path.isfile(self.source):
+            self._video = cv2.VideoCapture(self.source)
+            self.initialized = self._video.isOpened()
+        else:
+            pattern = self.source
+            if os.path.isdir(pattern):
+                pattern = os.path.join(pattern, "*")
+            paths = sorted(glob.glob(pattern))
+            self._images = [image for image in (cv2.imread(path) for path in paths) if image is not None]
+            self._images = [self._fit(image) for image in self._images]
+            self.initialized = bool(self._images)
+        
+        if not self.initialized:
+            print(f"Unable to open synthetic camera source: {self.source}")
+        return self.initialized
+    
+    def _make_background(self):
+        """Static textured background for procedural frames"""
+        rng = np.random.default_rng(0)
+        noise = rng.integers(0, 40, (self.height // 8, self.width // 8, 3), dtype=np.uint8)
+        background = cv2.resize(noise, (self.width, self.height), interpolation=cv2.INTER_LINEAR)
+        background += np.linspace(40, 120, self.width, dtype=np.uint8)[None, :, None]
+        return background
+    
+    def _fit(self, image, dst=None):
+        """Resize a frame to the configured output size, into dst if given"""
+        if image.shape[1] != self.width or image.shape[0] != self.height:
+            image = cv2.resize(image, (self.width, self.height), dst=dst, interpolation=cv2.INTER_AREA)
+        return image
+    
+    def _procedural_frame(self):
+        """Draw a few moving shapes over the background"""
+        frame = self._buffer
+        np.copyto(frame, self._background)
+        
+        t = self.frame_seq / 30.0
+        w, h = self.width, self.height
+        cx = int(w / 2 + w / 3 * np.sin(t * 0.7))
+        cy = int(h / 2 + h / 4 * np.cos(t * 1.1))
+        cv2.rectangle(frame, (cx - 90, cy - 60), (cx + 90, cy + 60), (40, 160, 220), -1)
+        cv2.circle(frame, (int(w / 2 - w / 4 * np.cos(t)), int(h / 3)), 70, (200, 200, 200), -1)
+        cv2.ellipse(frame, (int(w * 0.75), int(h * 0.7 + 40 * np.sin(t * 2))), (80, 40),
+                    float(t * 40 % 360), 0, 360, (30, 30, 200), -1)
+        return frame
+    
+    def read(self):
+        """Read a frame
+        
+        Returns:
+            tuple: (success, frame)
+        """
+        if not self.initialized:
+            return False, self._buffer
+        
+        if self.fps:
+            now = time.perf_counter()
+            if self._next_time > now:
+                time.sleep(self._next_time - now)
+            self._next_time = max(now, self._next_time) + 1.0 / self.fps
+        
+        if self._video is not None:
+            # Decode and resize into reused buffers
+            ret, frame = self._video.read(self._decoded)
+            if not ret and self.loop:
+                self._video.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                ret, frame = self._video.read(self._decoded)
+            if not ret:
+                return False, self.last_frame if self.last_frame is not None else self._buffer
+            self._decoded = frame
+            frame = self._fit(frame, dst=self._buffer)
+        elif self._images:
+            index = self.frame_seq
+            if index >= len(self._images) and not self.loop:
+                return False, self._images[-1]
+            frame = self._images[index % len(self._images)]
+        else:
+            frame = self._procedural_frame()
+        
+        self.frame_seq += 1
+        self.frame_timestamp = time.time()
+        self.last_frame = frame
+        return True, frame
+    
+    def wait_for_frame(self, after_seq=0, timeout=None):
+        """Get the next frame (synthetic sources never block)"""
+        ret, frame = self.read()
+        return ret, frame, self.frame_seq, self.frame_timestamp
+    
+    def release(self):
+        """Release the frame source"""
+        if self._video is not None:
+            self._video.release()
+            self._video = None
+        self.initialized = False
+    
+    def is_opened(self):
+        """Check whether the source is open"""
+        return self.initialized
+    
+    def get_resolution(self):
+        """Get output resolution"""
+        return self.width, self.height
@@ -0,0 +1,45 @@
+"""
+Confidence history tests - only inference runs vote
+"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from object_detector import DETECTION_DTYPE, ObjectDetector
+
+
+def make_detections(class_id, confidence):
+    detections = np.zeros(1, dtype=DETECTION_DTYPE)
+    detections["class_id"] = class_id
+    detections["confidence"] = confidence
+    detections["box"] = (100, 100, 200, 200)
+    return detections
+
+
+def make_detector():
+    detector = ObjectDetector(load_model=False)
+    detector._build_class_map({0: "person", 73: "book"})
+    detector.tracker = None
+    return detector
+
+
+def test_gated_frames_add_no_votes():
+    detector = make_detector()
+    detector._publish_results(make_detections(73, 0.9), 1, 0.0)
+    for step in range(1, 4):
+        detector._reuse_results(step * 0.1)
+    
+    assert detector.confidence_history.count == 1
+    assert not detector.check_target_found("book", 0.5)
+
+
+def test_two_inference_runs_confirm():
+    detector = make_detector()
+    detector._publish_results(make_detections(73, 0.9), 1, 0.0)
+    detector._reuse_results(0.1)
+    detector._publish_results(make_detections(73, 0.8), 2, 0.2)
+    
+    assert detector.check_target_found("book", 0.5)
@@ -0,0 +1,72 @@
+"""
+Tracker tests - a single inference run must not confirm a track
+"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import DETECTION
+from object_detector import DETECTION_DTYPE, ObjectDetector
+from tracker import ObjectTracker
+
+
+def make_detections(*boxes, class_id=41, confidence=0.9):
+    detections = np.empty(len(boxes), dtype=DETECTION_DTYPE)
+    detections["class_id"] = class_id
+    detections["confidence"] = confidence
+    detections["box"] = boxes
+    return detections
+
+
+def test_hold_adds_no_hits():
+    tracker = ObjectTracker()
+    tracker.update(make_detections((100, 100, 200, 200)), 0.0)
+    for step in range(1, 6):
+        tracker.hold(step * 0.1)
+    
+    tracks = tracker.predict(0.5)
+    assert len(tracks) == 1
+    assert tracks["hits"][0] == 1
+
+
+def test_hold_keeps_prediction():
+    tracker = ObjectTracker(velocity_smoothing=1.0)
+    tracker.update(make_detections((100, 100, 200, 200)), 0.0)
+    tracker.update(make_detections((105, 100, 205, 200)), 1.0)
+    tracker.hold(1.5)
+    
+    # Held tracks are still predicted forward from the last measurement
+    assert tuple(tracker.predict(1.6)["box"][0]) == (108, 100, 208, 200)
+    assert tracker.hits[0] == 2
+
+
+def test_update_after_hold_keeps_velocity():
+    tracker = ObjectTracker(velocity_smoothing=1.0)
+    tracker.update(make_detections((100, 100, 200, 200)), 0.0)
+    tracker.update(make_detections((105, 100, 205, 200)), 1.0)
+    velocities = tracker.velocities.copy()
+    
+    # 29 gated frames at 30 fps, then the next inference run sees the object where it should be
+    for step in range(1, 30):
+        tracker.hold(1.0 + step / 30)
+    tracker.update(make_detections((110, 100, 210, 200)), 2.0)
+    
+    np.testing.assert_allclose(tracker.velocities, velocities)
+    assert tuple(tracker.predict(3.0)["box"][0]) == (115, 100, 215, 200)
+
+
+def test_gated_frames_do_not_confirm_target():
+    detector = ObjectDetector(load_model=False)
+    detector._build_class_map({0: "person", 41: "cup"})
+    detector.tracker = ObjectTracker()
+    
+    detector._publish_results(make_detections((100, 100, 200, 200)), 1, 0.0)
+    for step in range(1, 6):
+        detector._reuse_results(step * 0.1)
+    
+    assert DETECTION["track_min_hits"] > 1
+    assert detector.get_tracks(0.5)["hits"][0] == 1
+    assert not detector.check_target_found("cup", 0.5)
@@ -0,0 +1,98 @@
+"""
+Tiling - Crop regions for small-object inference and cross-tile non-maximum suppression
+"""
+import numpy as np
+
+# Supported tiling modes
+MODES = ("center", "grid", "focus")
+
+
+def center_tile(width, height, scale=0.6):
+    """Centered crop covering scale of each frame dimension"""
+    tile_w, tile_h = int(width * scale), int(height * scale)
+    x1, y1 = (width - tile_w) // 2, (height - tile_h) // 2
+    return (x1, y1, x1 + tile_w, y1 + tile_h)
+
+
+def grid_tiles(width, height, grid=(2, 2), overlap=0.2):
+    """Grid of overlapping tiles covering the whole frame
+    
+    Args:
+        width: Frame width
+        height: Frame height
+        grid: (columns, rows)
+        overlap: Fraction of a tile shared with its neighbour
+    """
+    cols, rows = grid
+    tile_w = int(np.ceil(width / (cols - (cols - 1) * overlap)))
+    tile_h = int(np.ceil(height / (rows - (rows - 1) * overlap)))
+    xs = np.linspace(0, width - tile_w, cols).astype(int) if cols > 1 else [0]
+    ys = np.linspace(0, height - tile_h, rows).astype(int) if rows > 1 else [0]
+    return [(int(x), int(y), int(x) + tile_w, int(y) + tile_h) for y in ys for x in xs]
+
+
+def focus_tile(width, height, box, scale=2.0, min_scale=0.4):
+    """Crop around the region an object was last seen in
+    
+    Args:
+        box: (x1, y1, x2, y2) of the object
+        scale: Crop size relative to the box
+        min_scale: Minimum crop size relative to the frame
+    """
+    x1, y1, x2, y2 = box
+    cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+    tile_w = int(min(width, max((x2 - x1) * scale, width * min_scale)))
+    tile_h = int(min(height, max((y2 - y1) * scale, height * min_scale)))
+    left = int(np.clip(cx - tile_w / 2, 0, width - tile_w))
+    top = int(np.clip(cy - tile_h / 2, 0, height - tile_h))
+    return (left, top, left + tile_w, top + tile_h)
+
+
+def make_tiles(width, height, mode, grid=(2, 2), overlap=0.2, center_scale=0.6, focus_box=None):
+    """Tiles for a tiling mode
+    
+    "focus" crops around focus_box and falls back to the center crop when
+    the object has not been seen yet.
+    
+    Returns:
+        list: (x1, y1, x2, y2) tiles in frame coordinates
+    """
+    if mode == "grid":
+        return grid_tiles(width, height, grid, overlap)
+    if mode == "focus" and focus_box is not None:
+        return [focus_tile(width, height, focus_box)]
+    if mode in MODES:
+        return [center_tile(width, height, center_scale)]
+    raise ValueError(f"Unknown tiling mode: {mode}")
+
+
+def nms(boxes, scores, class_ids, iou_threshold=0.5):
+    """Class-aware non-maximum suppression
+    
+    Boxes of different classes are shifted apart so they never overlap,
+    then greedy NMS runs once over all of them.
+    
+    Returns:
+        np.ndarray: Indices of the kept boxes, highest score first
+    """
+    if len(boxes) == 0:
+        return np.empty(0, dtype=np.intp)
+    
+    offset = class_ids.astype(np.float64)[:, None] * (boxes.max() + 1)
+    shifted = boxes.astype(np.float64) + offset
+    x1, y1, x2, y2 = shifted.T
+    areas = (x2 - x1) * (y2 - y1)
+    
+    order = np.argsort(-scores, kind="stable")
+    keep = []
+    while len(order):
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+        inter_w = np.clip(np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest]), 0, None)
+        inter_h = np.clip(np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest]), 0, None)
+        inter = inter_w * inter_h
+        union = areas[i] + areas[rest] - inter
+        iou = np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+        order = rest[iou <= iou_threshold]
+    return np.array(keep, dtype=np.intp)
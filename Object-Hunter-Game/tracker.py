@@ -0,0 +1,166 @@
+"""
+Object Tracker - IoU association and constant-velocity prediction between inference runs
+"""
+import numpy as np
+
+# One row per track: stable ID, model class ID, confidence, predicted box and match count
+TRACK_DTYPE = np.dtype([
+    ("track_id", np.int32),
+    ("class_id", np.int32),
+    ("confidence", np.float32),
+    ("box", np.int32, (4,)),
+    ("hits", np.int32)
+])
+
+
+def iou_matrix(boxes_a, boxes_b):
+    """Pairwise intersection over union of two sets of (x1, y1, x2, y2) boxes
+    
+    Returns:
+        np.ndarray: (len(boxes_a), len(boxes_b)) IoU values
+    """
+    a = boxes_a[:, None, :]
+    b = boxes_b[None, :, :]
+    inter_w = np.clip(np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]), 0, None)
+    inter_h = np.clip(np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]), 0, None)
+    inter = inter_w * inter_h
+    area_a = (a[..., 2] - a[..., 0]) * (a[..., 3] - a[..., 1])
+    area_b = (b[..., 2] - b[..., 0]) * (b[..., 3] - b[..., 1])
+    union = area_a + area_b - inter
+    return np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+
+
+class ObjectTracker:
+    """Carries detections across frames as tracks with stable IDs"""
+    
+    def __init__(self, iou_threshold=0.3, max_missed=2, max_prediction=1.0, velocity_smoothing=0.5):
+        """Initialize tracker
+        
+        Args:
+            iou_threshold: Minimum IoU to associate a detection with a track
+            max_missed: Inference runs a track may go unmatched before it is dropped
+            max_prediction: Longest time (seconds) a box is extrapolated forward
+            velocity_smoothing: Weight of the newest velocity measurement (0-1)
+        """
+        self.iou_threshold = iou_threshold
+        self.max_missed = max_missed
+        self.max_prediction = max_prediction
+        self.velocity_smoothing = velocity_smoothing
+        self.next_id = 1
+        self.clear()
+    
+    def clear(self):
+        """Remove all tracks"""
+        self.track_ids = np.empty(0, dtype=np.int32)
+        self.class_ids = np.empty(0, dtype=np.int32)
+        self.confidences = np.empty(0, dtype=np.float32)
+        self.boxes = np.empty((0, 4), dtype=np.float64)
+        self.velocities = np.empty((0, 4), dtype=np.float64)   # Box corner velocity in pixels per second
+        self.hits = np.empty(0, dtype=np.int32)
+        self.missed = np.empty(0, dtype=np.int32)
+        self.last_seen = np.empty(0, dtype=np.float64)
+    
+    def __len__(self):
+        return len(self.track_ids)
+    
+    def _extrapolate(self, timestamp):
+        """Track boxes moved forward to a timestamp"""
+        dt = np.clip(timestamp - self.last_seen, 0, self.max_prediction)
+        return self.boxes + self.velocities * dt[:, None]
+    
+    def update(self, detections, timestamp):
+        """Associate a new set of detections with the existing tracks
+        
+        Args:
+            detections: DETECTION_DTYPE array from one inference run
+            timestamp: Capture time of the frame the detections came from
+        """
+        det_boxes = detections["box"].astype(np.float64)
+        det_classes = detections["class_id"]
+        n, m = len(self.track_ids), len(detections)
+        
+        matched_tracks = np.empty(0, dtype=np.intp)
+        matched_dets = np.empty(0, dtype=np.intp)
+        if n and m:
+            iou = iou_matrix(self._extrapolate(timestamp), det_boxes)
+            iou[self.class_ids[:, None] != det_classes[None, :]] = 0
+            
+            # Greedy assignment, best overlap first
+            pairs = []
+            while True:
+                t, d = np.unravel_index(np.argmax(iou), iou.shape)
+                if iou[t, d] < self.iou_threshold:
+                    break
+                pairs.append((t, d))
+                iou[t, :] = 0
+                iou[:, d] = 0
+            if pairs:
+                matched_tracks, matched_dets = (np.array(index, dtype=np.intp) for index in zip(*pairs))
+        
+        # Update matched tracks, measuring velocity from the box displacement
+        if len(matched_tracks):
+            dt = timestamp - self.last_seen[matched_tracks]
+            new_boxes = det_boxes[matched_dets]
+            measured = np.zeros_like(new_boxes)
+            moving = dt > 0
+            measured[moving] = (new_boxes[moving] - self.boxes[matched_tracks][moving]) / dt[moving, None]
+            
+            s = self.velocity_smoothing
+            self.velocities[matched_tracks] = self.velocities[matched_tracks] * (1 - s) + measured * s
+            self.boxes[matched_tracks] = new_boxes
+            self.confidences[matched_tracks] = detections["confidence"][matched_dets]
+            self.hits[matched_tracks] += 1
+            self.last_seen[matched_tracks] = timestamp
+        
+        unmatched = np.ones(n, dtype=bool)
+        unmatched[matched_tracks] = False
+        self.missed[unmatched] += 1
+        self.missed[~unmatched] = 0
+        
+        # Drop tracks that have been missing for too long
+        keep = self.missed <= self.max_missed
+        if not keep.all():
+            for name in ("track_ids", "class_ids", "confidences", "boxes",
+                         "velocities", "hits", "missed", "last_seen"):
+                setattr(self, name, getattr(self, name)[keep])
+        
+        # Start new tracks for unmatched detections
+        new = np.ones(m, dtype=bool)
+        new[matched_dets] = False
+        count = int(np.count_nonzero(new))
+        if count:
+            self.track_ids = np.concatenate((self.track_ids, np.arange(self.next_id, self.next_id + count, dtype=np.int32)))
+            self.next_id += count
+            self.class_ids = np.concatenate((self.class_ids, det_classes[new]))
+            self.confidences = np.concatenate((self.confidences, detections["confidence"][new]))
+            self.boxes = np.concatenate((self.boxes, det_boxes[new]))
+            self.velocities = np.concatenate((self.velocities, np.zeros((count, 4))))
+            self.hits = np.concatenate((self.hits, np.ones(count, dtype=np.int32)))
+            self.missed = np.concatenate((self.missed, np.zeros(count, dtype=np.int32)))
+            self.last_seen = np.concatenate((self.last_seen, np.full(count, timestamp)))
+    
+    def hold(self, timestamp):
+        """Keep the tracks alive through a frame that was not run through the model
+        
+        The frame carries no measurement, so nothing changes: boxes,
+        velocities and last_seen stay at the last inference run (predict()
+        extrapolates from there), hits and missed counts are untouched, and
+        the next update() measures velocity over the full time since that run.
+        """
+    
+    def predict(self, timestamp):
+        """Tracks matched by the latest inference run, with boxes predicted to a timestamp
+        
+        Returns:
+            np.ndarray: TRACK_DTYPE array sorted by confidence
+        """
+        visible = np.flatnonzero(self.missed == 0)
+        visible = visible[np.argsort(-self.confidences[visible], kind="stable")]
+        
+        tracks = np.empty(len(visible), dtype=TRACK_DTYPE)
+        tracks["track_id"] = self.track_ids[visible]
+        tracks["class_id"] = self.class_ids[visible]
+        tracks["confidence"] = self.confidences[visible]
+        tracks["box"] = self._extrapolate(timestamp)[visible]
+        tracks["hits"] = self.hits[visible]
+        return tracks
@@ -0,0 +1,71 @@
+"""
+Transition - Menu transition state ticked by the game loop, with cached masks
+"""
+import time
+
+import cv2
+import numpy as np
+
+
+class Transition:
+    """Animated switch between two menus
+    
+    The game loop keeps running during the transition; each frame asks for
+    the current progress and composites the effect into the frame.
+    """
+    
+    def __init__(self, duration=0.5):
+        """Initialize transition
+        
+        Args:
+            duration: Transition length in seconds
+        """
+        self.duration = duration
+        self.from_menu = None
+        self.to_menu = None
+        self.start_time = 0
+        self.active = False
+        
+        # Circle wipe masks, rebuilt only when the frame size changes
+        self._distance = None     # Distance of each pixel from the frame center
+        self._outside = None      # Pixels outside the current circle (255) / inside (0)
+        self._black = None
+    
+    def start(self, from_menu, to_menu, now=None):
+        """Begin a transition from one menu to another"""
+        self.from_menu = from_menu
+        self.to_menu = to_menu
+        self.start_time = time.time() if now is None else now
+        self.active = True
+    
+    def stop(self):
+        """End the transition"""
+        self.active = False
+    
+    def progress(self, now=None):
+        """Progress from 0.0 to 1.0"""
+        now = time.time() if now is None else now
+        if self.duration <= 0:
+            return 1.0
+        return min(1.0, (now - self.start_time) / self.duration)
+    
+    def _ensure_masks(self, height, width):
+        """Build the radial distance map for a frame size"""
+        if self._distance is not None and self._distance.shape == (height, width):
+            return
+        
+        ys, xs = np.ogrid[:height, :width]
+        self._distance = np.sqrt((xs - width // 2) ** 2 + (ys - height // 2) ** 2).astype(np.float32)
+        self._outside = np.empty((height, width), dtype=np.uint8)
+        self._black = np.zeros((height, width, 3), dtype=np.uint8)
+    
+    def circle_wipe(self, frame, progress):
+        """Black out everything outside a circle that shrinks to the center as progress goes to 1"""
+        height, width = frame.shape[:2]
+        self._ensure_masks(height, width)
+        
+        max_radius = int(np.sqrt((width // 2) ** 2 + (height // 2) ** 2))
+        radius = int((1.0 - progress) * max_radius)
+        cv2.compare(self._distance, radius, cv2.CMP_GT, dst=self._outside)
+        cv2.copyTo(self._black, self._outside, frame)
+        return frame
@@ -0,0 +1,343 @@
+"""
+UI Cache - Reusable pre-rendered assets for the OpenCV drawn interface
+"""
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+
+class LRUCache:
+    """Small least-recently-used cache with a fixed number of entries"""
+    
+    def __init__(self, max_entries=16):
+        """Initialize cache
+        
+        Args:
+            max_entries: Number of entries kept before the oldest is evicted
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key):
+        """Get a cached value, or None if it is not cached"""
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+    
+    def put(self, key, value):
+        """Store a value, evicting the least recently used entry if full"""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
+    
+    def clear(self):
+        """Drop all cached entries"""
+        self._entries.clear()
+    
+    def __len__(self):
+        return len(self._entries)
+
+
+class GradientCache:
+    """Builds two-color gradients once and reuses them on later frames"""
+    
+    def __init__(self, max_entries=8):
+        """Initialize gradient cache
+        
+        Args:
+            max_entries: Number of (size, colors, orientation) gradients kept
+        """
+        self._cache = LRUCache(max_entries)
+    
+    def get(self, width, height, color1, color2, vertical=True):
+        """Get a gradient image
+        
+        Args:
+            width: Gradient width
+            height: Gradient height
+            color1: Start color (B,G,R)
+            color2: End color (B,G,R)
+            vertical: Gradient runs top to bottom if True, left to right otherwise
+        
+        Returns:
+            np.ndarray: (height, width, 3) uint8 gradient, must not be modified
+        """
+        key = (width, height, tuple(color1[:3]), tuple(color2[:3]), vertical)
+        gradient = self._cache.get(key)
+        if gradient is None:
+            gradient = self._cache.put(key, self._build(width, height, color1, color2, vertical))
+        return gradient
+    
+    @staticmethod
+    def _build(width, height, color1, color2, vertical):
+        """Build a gradient with NumPy broadcasting"""
+        steps = height if vertical else width
+        alpha = np.arange(steps, dtype=np.float64)[:, None] / max(steps - 1, 1)
+        
+        start = np.asarray(color1[:3], dtype=np.float64)
+        end = np.asarray(color2[:3], dtype=np.float64)
+        ramp = (start * (1 - alpha) + end * alpha).astype(np.uint8)
+        
+        if vertical:
+            gradient = np.broadcast_to(ramp[:, None, :], (height, width, 3))
+        else:
+            gradient = np.broadcast_to(ramp[None, :, :], (height, width, 3))
+        
+        # cv2 needs a real contiguous array, not a broadcast view
+        gradient = np.ascontiguousarray(gradient)
+        gradient.flags.writeable = False
+        return gradient
+
+
+class GlassPanelCache:
+    """Caches the rounded-rect masks and tinted overlays used by glass panels"""
+    
+    def __init__(self, draw_rounded_rect, max_entries=32):
+        """Initialize glass panel cache
+        
+        Args:
+            draw_rounded_rect: Function with the signature of Game.draw_rounded_rect
+            max_entries: Number of (size, radius, color) panels kept
+        """
+        self._draw_rounded_rect = draw_rounded_rect
+        self._cache = LRUCache(max_entries)
+    
+    def get(self, width, height, radius, color):
+        """Get the mask and tinted overlay for a panel
+        
+        Args:
+            width: Panel width
+            height: Panel height
+            radius: Corner radius
+            color: Tint color (B,G,R), any alpha component is ignored
+        
+        Returns:
+            tuple: (mask, overlay) where mask is a single-channel uint8 mask
+                   (255 inside the rounded rect) and overlay is the tinted panel
+        """
+        key = (width, height, radius, tuple(color[:3]))
+        panel = self._cache.get(key)
+        if panel is None:
+            panel = self._cache.put(key, self._build(width, height, radius, color[:3]))
+        return panel
+    
+    def _build(self, width, height, radius, color):
+        """Rasterize the rounded-rect mask and its tinted overlay"""
+        mask = np.zeros((height, width, 3), dtype=np.uint8)
+        self._draw_rounded_rect(mask, (0, 0, width, height), (255, 255, 255), radius)
+        
+        overlay = mask.copy()
+        self._draw_rounded_rect(overlay, (0, 0, width, height), color, radius)
+        
+        # The mask is drawn in white, so one channel carries all the coverage.
+        # A single-channel uint8 mask keeps cv2.copyTo on its fast path.
+        mask = np.where(mask[:, :, 0] > 0, 255, 0).astype(np.uint8)
+        mask.flags.writeable = False
+        overlay.flags.writeable = False
+        return mask, overlay
+
+
+class TextSpriteCache:
+    """Rasterizes text (with an optional glow) once into alpha sprites
+    
+    Drawing a cached string is one alpha blend of the sprite onto the
+    frame instead of one or more cv2.putText calls. Text sizes are cached
+    too, since cv2.getTextSize is called every frame for fixed strings.
+    """
+    
+    def __init__(self, max_entries=96, font=cv2.FONT_HERSHEY_SIMPLEX, glow_step=32):
+        """Initialize text sprite cache
+        
+        Args:
+            max_entries: Number of sprites kept before the oldest is evicted
+            font: OpenCV font face
+            glow_step: Glow color channels are rounded to this step, so a
+                       pulsing glow maps onto a small set of sprites
+        """
+        self.font = font
+        self.glow_step = glow_step
+        self._sprites = LRUCache(max_entries)
+        self._sizes = LRUCache(max_entries * 4)
+    
+    def _text_size(self, text, scale, thickness):
+        """Cached cv2.getTextSize result ((width, height), baseline)"""
+        key = (text, scale, thickness)
+        size = self._sizes.get(key)
+        if size is None:
+            size = self._sizes.put(key, cv2.getTextSize(text, self.font, scale, thickness))
+        return size
+    
+    def measure(self, text, scale, thickness=1):
+        """Get the (width, height) of a string, like cv2.getTextSize(...)[0]"""
+        return self._text_size(text, scale, thickness)[0]
+    
+    def _quantize(self, color):
+        step = self.glow_step
+        return tuple(min(255, int(round(c / step)) * step) for c in color[:3])
+    
+    def draw(self, frame, text, org, scale, color, thickness=1, line_type=cv2.LINE_8,
+             glow=0, glow_color=None):
+        """Draw text like cv2.putText, optionally with a horizontal glow
+        
+        Args:
+            frame: Image to draw on
+            text: String to draw
+            org: Bottom-left corner of the text (cv2.putText origin)
+            scale: Font scale
+            color: Text color (B,G,R)
+            thickness: Stroke thickness
+            line_type: cv2.LINE_8 or cv2.LINE_AA
+            glow: Glow width in pixels, the text is smeared this far left and right
+            glow_color: Glow color (B,G,R), rounded to glow_step
+        """
+        if glow > 0 and glow_color is not None:
+            glow_color = self._quantize(glow_color)
+        else:
+            glow, glow_color = 0, None
+        
+        key = (text, scale, tuple(color[:3]), thickness, line_type, glow, glow_color)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            sprite = self._sprites.put(key, self._build(text, scale, color[:3], thickness,
+                                                        line_type, glow, glow_color))
+        self._blit(frame, sprite, org)
+    
+    def _build(self, text, scale, color, thickness, line_type, glow, glow_color):
+        """Rasterize a string into a cropped sprite
+        
+        Returns:
+            tuple: (color image, alpha, 1 - alpha, (x, y) offset of the sprite from the text origin)
+        """
+        (text_w, text_h), baseline = self._text_size(text, scale, thickness)
+        pad = glow + thickness + 2
+        height, width = text_h + baseline + 2 * pad, text_w + 2 * pad
+        origin = (pad, pad + text_h)
+        
+        coverage = np.zeros((height, width), dtype=np.uint8)
+        cv2.putText(coverage, text, origin, self.font, scale, 255, thickness, line_type)
+        text_alpha = coverage.astype(np.float32) / 255
+        
+        if glow:
+            # The glow is the text shifted up to glow pixels left and right, drawn under the text
+            glow_alpha = cv2.dilate(coverage, np.ones((1, 2 * glow + 1), dtype=np.uint8)).astype(np.float32) / 255
+            alpha = glow_alpha + text_alpha - glow_alpha * text_alpha
+            premultiplied = (np.asarray(glow_color, dtype=np.float32) * (glow_alpha * (1 - text_alpha))[..., None]
+                             + np.asarray(color, dtype=np.float32) * text_alpha[..., None])
+            image = np.divide(premultiplied, alpha[..., None], out=np.zeros_like(premultiplied),
+                              where=alpha[..., None] > 0)
+            image = np.clip(image + 0.5, 0, 255).astype(np.uint8)
+        else:
+            alpha = text_alpha
+            image = np.empty((height, width, 3), dtype=np.uint8)
+            image[:] = color
+        
+        # Crop to the drawn pixels
+        rows = np.flatnonzero(alpha.any(axis=1))
+        cols = np.flatnonzero(alpha.any(axis=0))
+        if not len(rows):
+            return None
+        y1, y2, x1, x2 = rows[0], rows[-1] + 1, cols[0], cols[-1] + 1
+        
+        alpha = np.ascontiguousarray(alpha[y1:y2, x1:x2])
+        sprite = (np.ascontiguousarray(image[y1:y2, x1:x2]), alpha, 1 - alpha,
+                  (x1 - origin[0], y1 - origin[1]))
+        for array in sprite[:3]:
+            array.flags.writeable = False
+        return sprite
+    
+    @staticmethod
+    def _blit(frame, sprite, org):
+        """Alpha blend a sprite onto the frame, clipped to the frame"""
+        if sprite is None:
+            return
+        image, alpha, inverse, (dx, dy) = sprite
+        x, y = int(org[0]) + dx, int(org[1]) + dy
+        h, w = alpha.shape
+        
+        x1, y1 = max(x, 0), max(y, 0)
+        x2, y2 = min(x + w, frame.shape[1]), min(y + h, frame.shape[0])
+        if x1 >= x2 or y1 >= y2:
+            return
+        
+        sx, sy = x1 - x, y1 - y
+        region = frame[y1:y2, x1:x2]
+        region[:] = cv2.blendLinear(region, image[sy:sy + y2 - y1, sx:sx + x2 - x1],
+                                    inverse[sy:sy + y2 - y1, sx:sx + x2 - x1],
+                                    alpha[sy:sy + y2 - y1, sx:sx + x2 - x1])
+
+
+class StaticLayerCache:
+    """Caches the static part of a screen, rendered once per state and size
+    
+    The layer is rendered twice, over black and over white, which gives its
+    premultiplied color and how much of the background shows through each
+    pixel. Every frame the layer is composited over the live frame, so the
+    camera image stays visible behind the menus. Blurs inside the layer
+    (glass panels) see a flat background, so the camera shows through them
+    unblurred, at the small weight the glass leaves it.
+    """
+    
+    def __init__(self, max_entries=6):
+        """Initialize layer cache
+        
+        Args:
+            max_entries: Number of (screen, size, state) layers kept
+        """
+        self._cache = LRUCache(max_entries)
+    
+    def draw(self, frame, key, render):
+        """Composite the cached layer for a state over the frame
+        
+        Args:
+            frame: Frame to draw into
+            key: Hashable screen state, everything the layer depends on
+                 besides the frame size
+            render: Function render(layer) drawing the static part onto the
+                    given background, its return value is cached with the layer
+        
+        Returns:
+            The value returned by render when the layer was built
+        """
+        key = (frame.shape, key)
+        entry = self._cache.get(key)
+        if entry is None:
+            entry = self._cache.put(key, self._build(frame.shape, frame.dtype, render))
+        
+        color, transmission, result = entry
+        # frame = color + frame * transmission / 255
+        cv2.multiply(frame, transmission, dst=frame, scale=1 / 255)
+        cv2.add(frame, color, dst=frame)
+        return result
+    
+    @staticmethod
+    def _build(shape, dtype, render):
+        """Render a layer over black and white to recover color and transmission
+        
+        Returns:
+            tuple: (premultiplied color, per-channel transmission 0-255, render result)
+        """
+        over_black = np.zeros(shape, dtype=dtype)
+        result = render(over_black)
+        over_white = np.full(shape, 255, dtype=dtype)
+        render(over_white)
+        
+        # Over black only the layer's own color remains; the white background
+        # adds 255 times the fraction of the background that shows through
+        transmission = cv2.subtract(over_white, over_black)
+        over_black.flags.writeable = False
+        transmission.flags.writeable = False
+        return over_black, transmission, result
+    
+    def clear(self):
+        """Drop all cached layers"""
+        self._cache.clear()